@@ -2,13 +2,15 @@
 FastAPI application - REST API endpoints for Docker Auto-Heal Service
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import json
 
@@ -27,11 +29,26 @@ from app.notifications.notification_manager import notification_manager
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Feed /api/events/stream from the serving loop for as long as the app runs"""
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+    config_manager.add_event_listener(_broadcast_event)
+    try:
+        yield
+    finally:
+        config_manager.remove_event_listener(_broadcast_event)
+        _event_loop = None
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Docker Auto-Heal Service",
     description="Automated container monitoring and healing service",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -51,17 +68,21 @@ except Exception as e:
     logger.warning(f"Assets directory not found: {e}")
 
 # Global instances (will be initialized in main.py)
-docker_client: Optional[DockerClientWrapper] = None
 monitoring_engine: Optional[MonitoringEngine] = None
 
 
 def init_api(docker_client_instance: DockerClientWrapper, monitoring_engine_instance: MonitoringEngine):
     """Initialize API with Docker client and monitoring engine"""
-    global docker_client, monitoring_engine
-    docker_client = docker_client_instance
+    global monitoring_engine
+    app.state.docker = docker_client_instance
     monitoring_engine = monitoring_engine_instance
 
 
+def get_docker() -> Optional[DockerClientWrapper]:
+    """Dependency returning the service's shared Docker client (None until init_api runs)"""
+    return getattr(app.state, "docker", None)
+
+
 # ==================== Pydantic Models for API ====================
 
 class ContainerSelectionRequest(BaseModel):
@@ -98,12 +119,12 @@ class SystemStatus(BaseModel):
 # ==================== Health & Status Endpoints ====================
 
 @app.get("/health")
-async def health_check():
+async def health_check(docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Health check endpoint for the service itself"""
     return {
         "status": "healthy",
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "docker_connected": docker_client.is_connected() if docker_client else False,
+        "docker_connected": await asyncio.to_thread(docker_client.is_connected) if docker_client else False,
         "monitoring_active": monitoring_engine._running if monitoring_engine else False
     }
 
@@ -115,17 +136,17 @@ async def get_manifest():
     return FileResponse("static/manifest.webmanifest", media_type="application/manifest+json")
 
 @app.get("/api/status", response_model=SystemStatus)
-async def get_system_status():
+async def get_system_status(docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Get overall system status"""
     try:
         config = config_manager.get_config()
         # Get ALL containers (including stopped) for accurate count
-        containers = docker_client.list_containers(all_containers=True) if docker_client else []
+        containers = await asyncio.to_thread(docker_client.list_containers, all_containers=True) if docker_client else []
         monitored_count = 0
 
         # Count monitored containers
         for container in containers:
-            info = docker_client.get_container_info(container)
+            info = await asyncio.to_thread(docker_client.get_container_info, container)
             if monitoring_engine and info:
                 if monitoring_engine.should_monitor_container(container, info):
                     monitored_count += 1
@@ -133,7 +154,7 @@ async def get_system_status():
         maintenance_start = config_manager.get_maintenance_start_time()
         return SystemStatus(
             monitoring_active=monitoring_engine._running if monitoring_engine else False,
-            docker_connected=docker_client.is_connected() if docker_client else False,
+            docker_connected=await asyncio.to_thread(docker_client.is_connected) if docker_client else False,
             total_containers=len(containers),
             monitored_containers=monitored_count,
             quarantined_containers=len(config_manager.get_quarantined_containers()),
@@ -149,13 +170,14 @@ async def get_system_status():
 # ==================== Container Management Endpoints ====================
 
 @app.get("/api/containers", response_model=List[ContainerInfo])
-async def list_containers(include_stopped: bool = False):
+async def list_containers(include_stopped: bool = False,
+                          docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """List all containers with their monitoring status"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
-        containers = docker_client.list_containers(all_containers=include_stopped)
+        containers = await asyncio.to_thread(docker_client.list_containers, all_containers=include_stopped)
         result = []
         
         # Get Uptime Kuma configuration
@@ -168,7 +190,7 @@ async def list_containers(include_stopped: bool = False):
             uptime_kuma_monitor = monitoring_engine.uptime_kuma_monitor
 
         for container in containers:
-            info = docker_client.get_container_info(container)
+            info = await asyncio.to_thread(docker_client.get_container_info, container)
             if not info:
                 continue
 
@@ -231,17 +253,18 @@ async def list_containers(include_stopped: bool = False):
 
 
 @app.get("/api/containers/{container_id}")
-async def get_container_details(container_id: str):
+async def get_container_details(container_id: str,
+                                docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Get detailed information about a specific container"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
-        container = docker_client.get_container(container_id)
+        container = await asyncio.to_thread(docker_client.get_container, container_id)
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
-        info = docker_client.get_container_info(container)
+        info = await asyncio.to_thread(docker_client.get_container_info, container)
 
         # Use stable_id for tracking (persists across recreations)
         full_container_id = info.get("full_id")
@@ -287,7 +310,8 @@ async def get_container_details(container_id: str):
 
 
 @app.post("/api/containers/select")
-async def update_container_selection(request: ContainerSelectionRequest):
+async def update_container_selection(request: ContainerSelectionRequest,
+                                     docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Enable or disable auto-heal for specific containers"""
     try:
         logger.debug(f"Container selection request: containers={request.container_ids}, enabled={request.enabled}")
@@ -297,9 +321,9 @@ async def update_container_selection(request: ContainerSelectionRequest):
             # Add to selected list - resolve stable identifiers for persistence
             for cid in request.container_ids:
                 # Try to get container to resolve its stable identifier
-                container = docker_client.get_container(cid)
+                container = await asyncio.to_thread(docker_client.get_container, cid)
                 if container:
-                    info = docker_client.get_container_info(container)
+                    info = await asyncio.to_thread(docker_client.get_container_info, container)
                     container_name = info.get("name")
 
                     # Get stable identifier (handles all edge cases)
@@ -336,9 +360,9 @@ async def update_container_selection(request: ContainerSelectionRequest):
             # Add to excluded list - resolve stable identifiers for persistence
             for cid in request.container_ids:
                 # Try to get container to resolve its stable identifier
-                container = docker_client.get_container(cid)
+                container = await asyncio.to_thread(docker_client.get_container, cid)
                 if container:
-                    info = docker_client.get_container_info(container)
+                    info = await asyncio.to_thread(docker_client.get_container_info, container)
                     container_name = info.get("name")
 
                     # Get stable identifier
@@ -383,17 +407,18 @@ async def update_container_selection(request: ContainerSelectionRequest):
 
 
 @app.post("/api/containers/{container_id}/restart")
-async def restart_container_manual(container_id: str):
+async def restart_container_manual(container_id: str,
+                                   docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Manually restart a container"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
-        container = docker_client.get_container(container_id)
+        container = await asyncio.to_thread(docker_client.get_container, container_id)
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
-        success = docker_client.restart_container(container)
+        success = await docker_client.restart_container_async(container)
 
         if success:
             return {"status": "success", "message": f"Container {container_id} restarted"}
@@ -407,18 +432,19 @@ async def restart_container_manual(container_id: str):
 
 
 @app.post("/api/containers/{container_id}/unquarantine")
-async def unquarantine_container(container_id: str):
+async def unquarantine_container(container_id: str,
+                                 docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Remove container from quarantine"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
         # Get the container to resolve stable_id
-        container = docker_client.get_container(container_id)
+        container = await asyncio.to_thread(docker_client.get_container, container_id)
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
-        info = docker_client.get_container_info(container)
+        info = await asyncio.to_thread(docker_client.get_container_info, container)
         container_name = info.get("name")
         stable_id = info.get("stable_id")
 
@@ -580,14 +606,15 @@ async def import_config(file: UploadFile = File(...)):
 # ==================== Health Check Management ====================
 
 @app.post("/api/healthchecks")
-async def add_health_check(health_check: HealthCheckConfig):
+async def add_health_check(health_check: HealthCheckConfig,
+                           docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Add custom health check for a container"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
         # Get the container to resolve full container ID
-        container = docker_client.get_container(health_check.container_id)
+        container = await asyncio.to_thread(docker_client.get_container, health_check.container_id)
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
@@ -604,14 +631,15 @@ async def add_health_check(health_check: HealthCheckConfig):
 
 
 @app.get("/api/healthchecks/{container_id}")
-async def get_health_check(container_id: str):
+async def get_health_check(container_id: str,
+                           docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Get custom health check for a container"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
         # Get the container to resolve full container ID
-        container = docker_client.get_container(container_id)
+        container = await asyncio.to_thread(docker_client.get_container, container_id)
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
@@ -628,14 +656,15 @@ async def get_health_check(container_id: str):
 
 
 @app.delete("/api/healthchecks/{container_id}")
-async def delete_health_check(container_id: str):
+async def delete_health_check(container_id: str,
+                              docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Delete custom health check for a container"""
     try:
         if not docker_client:
             raise HTTPException(status_code=500, detail="Docker client not initialized")
 
         # Get the container to resolve full container ID
-        container = docker_client.get_container(container_id)
+        container = await asyncio.to_thread(docker_client.get_container, container_id)
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
@@ -657,28 +686,84 @@ async def list_health_checks():
 
 # ==================== Event Log Endpoints ====================
 
+# Seconds between SSE keep-alive comments when no events arrive
+EVENT_STREAM_KEEPALIVE_SECONDS = 15
+# Events buffered per stream subscriber before new ones are dropped
+EVENT_STREAM_QUEUE_SIZE = 100
+
+# Queues of connected /api/events/stream clients, fed from config_manager.add_event
+_event_subscribers: Set[asyncio.Queue] = set()
+# Loop serving the app, set for the duration of its lifespan
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _event_to_dict(event: AutoHealEvent) -> Dict[str, Any]:
+    """Serialize an event for API responses"""
+    return {
+        "timestamp": event.timestamp.isoformat(),
+        "container_id": event.container_id,
+        "container_name": event.container_name,
+        "event_type": event.event_type,
+        "restart_count": event.restart_count,
+        "status": event.status,
+        "message": event.message
+    }
+
+
+def _offer_event(queue: asyncio.Queue, data: Dict[str, Any]) -> None:
+    """Queue an event for a subscriber, dropping it if the client isn't keeping up"""
+    try:
+        queue.put_nowait(data)
+    except asyncio.QueueFull:
+        pass
+
+
+def _broadcast_event(event: AutoHealEvent) -> None:
+    """Fan a new event out to stream subscribers (called from any thread)"""
+    loop = _event_loop
+    if loop is None or not _event_subscribers:
+        return
+
+    data = _event_to_dict(event)
+    for queue in list(_event_subscribers):
+        loop.call_soon_threadsafe(_offer_event, queue, data)
+
+
 @app.get("/api/events")
-async def get_events(limit: int = 100):
-    """Get recent auto-heal events"""
+async def get_events(limit: int = 100, container_id: Optional[str] = None, event_type: Optional[str] = None):
+    """Get recent auto-heal events, optionally for one container (indexed by short ID) and/or event type"""
     try:
-        events = config_manager.get_events(limit)
-        return [
-            {
-                "timestamp": event.timestamp.isoformat(),
-                "container_id": event.container_id,
-                "container_name": event.container_name,
-                "event_type": event.event_type,
-                "restart_count": event.restart_count,
-                "status": event.status,
-                "message": event.message
-            }
-            for event in events
-        ]
+        events = config_manager.get_events(limit, container_id=container_id, event_type=event_type)
+        return [_event_to_dict(event) for event in events]
     except Exception as e:
         logger.error(f"Error getting events: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/events/stream")
+async def stream_events():
+    """Stream new auto-heal events as Server-Sent Events"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_STREAM_QUEUE_SIZE)
+    _event_subscribers.add(queue)
+
+    async def event_source():
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=EVENT_STREAM_KEEPALIVE_SECONDS)
+                    yield f"data: {json.dumps(data)}\n\n"
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            _event_subscribers.discard(queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.delete("/api/events")
 async def clear_events():
     """Clear all events from the log"""
@@ -743,16 +828,16 @@ async def test_uptime_kuma_connection(config_data: dict):
     from app.uptime_kuma.uptime_kuma_client import UptimeKumaClient
 
     try:
-        client = UptimeKumaClient(
+        async with UptimeKumaClient(
             config_data.get('server_url'),
             config_data.get('api_token'),      # password (API key or user password)
             config_data.get('username', '')    # username (optional, empty for API key)
-        )
-        success = await client.connect()
+        ) as client:
+            success = await client.connect()
+            # Fetch monitors to validate full access
+            monitors = await client.get_all_monitors() if success else []
 
         if success:
-            # Fetch monitors to validate full access
-            monitors = await client.get_all_monitors()
             return {
                 "success": True,
                 "message": "Connection successful",
@@ -772,7 +857,8 @@ async def test_uptime_kuma_connection(config_data: dict):
 
 
 @app.post("/api/uptime-kuma/enable")
-async def enable_uptime_kuma_integration(integration_config: dict):
+async def enable_uptime_kuma_integration(integration_config: dict,
+                                         docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Enable Uptime-Kuma integration and fetch monitors"""
     from app.uptime_kuma.uptime_kuma_client import UptimeKumaClient
     from app.config.config_manager import UptimeKumaMapping
@@ -787,21 +873,21 @@ async def enable_uptime_kuma_integration(integration_config: dict):
         config.uptime_kuma.auto_restart_on_down = integration_config.get('auto_restart_on_down', True)
 
         # Fetch monitors
-        client = UptimeKumaClient(
+        async with UptimeKumaClient(
             config.uptime_kuma.server_url,
             config.uptime_kuma.api_token,      # password (API key or user password)
             config.uptime_kuma.username        # username (optional, empty for API key)
-        )
-        monitors = await client.get_all_monitors()
+        ) as client:
+            monitors = await client.get_all_monitors()
 
         # Perform auto-mapping
-        containers = docker_client.list_containers(all_containers=False)
+        containers = await asyncio.to_thread(docker_client.list_containers, all_containers=False)
         auto_mappings = []
 
         for container in containers:
             container_name = container.name
             # Get container info to extract stable_id
-            info = docker_client.get_container_info(container)
+            info = await asyncio.to_thread(docker_client.get_container_info, container)
             if not info:
                 continue
 
@@ -854,12 +940,12 @@ async def get_uptime_kuma_monitors():
         raise HTTPException(status_code=400, detail="Uptime-Kuma integration not enabled")
 
     try:
-        client = UptimeKumaClient(
+        async with UptimeKumaClient(
             config.uptime_kuma.server_url,
             config.uptime_kuma.api_token,      # password (API key or user password)
             config.uptime_kuma.username        # username (optional, empty for API key)
-        )
-        monitors = await client.get_all_monitors()
+        ) as client:
+            monitors = await client.get_all_monitors()
         return {"monitors": monitors}
     except Exception as e:
         logger.error(f"Failed to fetch Uptime-Kuma monitors: {e}")
@@ -876,17 +962,18 @@ async def get_uptime_kuma_mappings():
 
 
 @app.post("/api/uptime-kuma/mappings")
-async def create_uptime_kuma_mapping(mapping: dict):
+async def create_uptime_kuma_mapping(mapping: dict,
+                                     docker_client: Optional[DockerClientWrapper] = Depends(get_docker)):
     """Create a new container-to-monitor mapping"""
     from app.config.config_manager import UptimeKumaMapping
 
     try:
         # Get the container to resolve stable_id
-        container = docker_client.get_container(mapping['container_id'])
+        container = await asyncio.to_thread(docker_client.get_container, mapping['container_id'])
         if not container:
             raise HTTPException(status_code=404, detail="Container not found")
 
-        info = docker_client.get_container_info(container)
+        info = await asyncio.to_thread(docker_client.get_container_info, container)
         container_name = info.get("name")
         stable_id = info.get("stable_id")
 
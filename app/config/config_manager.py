@@ -3,7 +3,7 @@ Configuration management for Docker Auto-Heal Service
 Handles in-memory configuration state with JSON export/import support
 """
 
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime, timezone
 import json
@@ -173,6 +173,7 @@ class AutoHealEvent(BaseModel):
     restart_count: int
     status: str  # success, failure, quarantined
     message: str
+    docker_name: Optional[str] = None  # Plain Docker name; container_name is a display string
 
 
 class ConfigManager:
@@ -201,6 +202,11 @@ class ConfigManager:
         # Load persisted data or initialize with defaults
         self._config = self._load_config()
         self._event_log: List[AutoHealEvent] = self._load_events()
+        # Events per short (12 char) container ID, oldest first, mirroring _event_log
+        self._events_by_container: Dict[str, List[AutoHealEvent]] = {}
+        for event in self._event_log:
+            self._events_by_container.setdefault(event.container_id[:12], []).append(event)
+        self._event_listeners: List[Callable[[AutoHealEvent], None]] = []
         self._custom_health_checks: Dict[str, HealthCheckConfig] = self._load_custom_health_checks()
         # _container_restart_counts removed - now stored in self._config.containers.restart_counts
         self._quarantined_containers: set = self._load_quarantine()
@@ -392,22 +398,68 @@ class ConfigManager:
         """Add event to log (thread-safe, with size limit)"""
         with self._lock:
             self._event_log.append(event)
+            self._events_by_container.setdefault(event.container_id[:12], []).append(event)
             max_entries = self._config.ui.max_log_entries
             if len(self._event_log) > max_entries:
+                dropped = self._event_log[:-max_entries]
                 self._event_log = self._event_log[-max_entries:]
+                # Dropped events are the oldest, so they lead their container's list
+                for old_event in dropped:
+                    key = old_event.container_id[:12]
+                    container_events = self._events_by_container[key]
+                    del container_events[0]
+                    if not container_events:
+                        del self._events_by_container[key]
             self._save_events()
+            listeners = list(self._event_listeners)
 
-    def get_events(self, limit: Optional[int] = None) -> List[AutoHealEvent]:
-        """Get event log (thread-safe)"""
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Event listener failed: {e}")
+
+    def add_event_listener(self, listener: Callable[[AutoHealEvent], None]) -> None:
+        """Register a callback invoked with every new event (may run on any thread)"""
+        with self._lock:
+            self._event_listeners.append(listener)
+
+    def remove_event_listener(self, listener: Callable[[AutoHealEvent], None]) -> None:
+        """Unregister an event callback"""
+        with self._lock:
+            if listener in self._event_listeners:
+                self._event_listeners.remove(listener)
+
+    def get_events(self, limit: Optional[int] = None, container_id: Optional[str] = None,
+                   event_type: Optional[str] = None) -> List[AutoHealEvent]:
+        """
+        Get event log (thread-safe)
+        Args:
+            limit: Return only the most recent N matching events
+            container_id: Only events for this container (full ID, short ID or any ID prefix)
+            event_type: Only events of this type
+        """
         with self._lock:
+            if container_id and len(container_id) < 12:
+                # Shorter than the index key, scan the log by prefix
+                events = [e for e in self._event_log if e.container_id.startswith(container_id)]
+            elif container_id:
+                events = self._events_by_container.get(container_id[:12], [])
+                if len(container_id) > 12:
+                    events = [e for e in events if e.container_id.startswith(container_id)]
+            else:
+                events = self._event_log
+            if event_type:
+                events = [e for e in events if e.event_type == event_type]
             if limit:
-                return self._event_log[-limit:]
-            return self._event_log.copy()
+                return events[-limit:]
+            return list(events)
 
     def clear_events(self) -> None:
         """Clear all events from log (thread-safe)"""
         with self._lock:
             self._event_log.clear()
+            self._events_by_container.clear()
             self._save_events()
             logger.info("All events cleared")
 
@@ -3,75 +3,82 @@ Initialize default configuration and data files on first startup
 This module creates all necessary files in /data directory if they don't exist
 """
 
-import json
+import copy
 import logging
 from pathlib import Path
 from typing import Dict, Any
 
+from app.utils import json_utils
+
 logger = logging.getLogger(__name__)
 
 
-def get_default_config() -> Dict[str, Any]:
-    """Get default configuration dictionary"""
-    return {
-        "monitor": {
-            "interval_seconds": 30,
-            "label_key": "autoheal",
-            "label_value": "true",
-            "include_all": False
-        },
-        "containers": {
-            "selected": [],
-            "excluded": [],
-            "restart_counts": {}
-        },
-        "restart": {
-            "mode": "on-failure",
-            "cooldown_seconds": 60,
-            "max_restarts": 3,
-            "max_restarts_window_seconds": 600,
-            "backoff": {
-                "enabled": True,
-                "initial_seconds": 10,
-                "multiplier": 2.0
-            },
-            "respect_manual_stop": True
-        },
-        "filters": {
-            "whitelist_names": [],
-            "blacklist_names": [],
-            "whitelist_labels": [],
-            "blacklist_labels": []
-        },
-        "ui": {
-            "enable": True,
-            "listen_address": "0.0.0.0",
-            "listen_port": 3131,
-            "allow_export_json": True,
-            "allow_import_json": True,
-            "max_log_entries": 50
-        },
-        "alerts": {
+# Default configuration template, built once at import time.
+# Callers always receive a deep copy so the template is never mutated.
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "monitor": {
+        "interval_seconds": 30,
+        "label_key": "autoheal",
+        "label_value": "true",
+        "include_all": False
+    },
+    "containers": {
+        "selected": [],
+        "excluded": [],
+        "restart_counts": {}
+    },
+    "restart": {
+        "mode": "on-failure",
+        "cooldown_seconds": 60,
+        "max_restarts": 3,
+        "max_restarts_window_seconds": 600,
+        "backoff": {
             "enabled": True,
-            "webhook": None,
-            "notify_on_quarantine": True
+            "initial_seconds": 10,
+            "multiplier": 2.0
         },
-        "observability": {
-            "prometheus_enabled": True,
-            "metrics_port": 9090,
-            "log_format": "json",
-            "log_level": "INFO"
-        },
-        "uptime_kuma": {
-            "enabled": False,
-            "server_url": "",
-            "username": "",
-            "api_token": "",
-            "auto_restart_on_down": True
-        },
-        "uptime_kuma_mappings": [],
-        "custom_health_checks": {}
-    }
+        "respect_manual_stop": True
+    },
+    "filters": {
+        "whitelist_names": [],
+        "blacklist_names": [],
+        "whitelist_labels": [],
+        "blacklist_labels": []
+    },
+    "ui": {
+        "enable": True,
+        "listen_address": "0.0.0.0",
+        "listen_port": 3131,
+        "allow_export_json": True,
+        "allow_import_json": True,
+        "max_log_entries": 50
+    },
+    "alerts": {
+        "enabled": True,
+        "webhook": None,
+        "notify_on_quarantine": True
+    },
+    "observability": {
+        "prometheus_enabled": True,
+        "metrics_port": 9090,
+        "log_format": "json",
+        "log_level": "INFO"
+    },
+    "uptime_kuma": {
+        "enabled": False,
+        "server_url": "",
+        "username": "",
+        "api_token": "",
+        "auto_restart_on_down": True
+    },
+    "uptime_kuma_mappings": [],
+    "custom_health_checks": {}
+}
+
+
+def get_default_config() -> Dict[str, Any]:
+    """Get default configuration dictionary"""
+    return copy.deepcopy(_DEFAULT_CONFIG)
 
 
 def get_default_events() -> list:
@@ -104,16 +111,16 @@ def init_data_file(file_path: Path, default_data: Any, description: str) -> bool
     Returns:
         True if file was created, False if it already existed
     """
-    if file_path.exists():
-        logger.debug(f"{description} already exists at {file_path}")
-        return False
-
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w') as f:
-            json.dump(default_data, f, indent=2)
+        # 'x' mode creates the file atomically and fails if it already exists
+        with open(file_path, 'xb') as f:
+            f.write(json_utils.dumps(default_data, indent=True))
         logger.info(f"Created default {description} at {file_path}")
         return True
+    except FileExistsError:
+        logger.debug(f"{description} already exists at {file_path}")
+        return False
     except Exception as e:
         logger.error(f"Failed to create {description} at {file_path}: {e}")
         return False
@@ -148,27 +155,17 @@ def initialize_defaults(data_dir: Path = Path("/data")) -> None:
         logger.error(f"Failed to create logs directory: {e}")
 
     # Initialize each data file
-    files_created = 0
-
-    # 1. config.json
-    config_file = data_dir / "config.json"
-    if init_data_file(config_file, get_default_config(), "config.json"):
-        files_created += 1
-
-    # 2. events.json
-    events_file = data_dir / "events.json"
-    if init_data_file(events_file, get_default_events(), "events.json"):
-        files_created += 1
-
-    # 3. quarantine.json
-    quarantine_file = data_dir / "quarantine.json"
-    if init_data_file(quarantine_file, get_default_quarantine(), "quarantine.json"):
-        files_created += 1
+    files = {
+        "config.json": get_default_config(),
+        "events.json": get_default_events(),
+        "quarantine.json": get_default_quarantine(),
+        "maintenance.json": get_default_maintenance()
+    }
 
-    # 4. maintenance.json
-    maintenance_file = data_dir / "maintenance.json"
-    if init_data_file(maintenance_file, get_default_maintenance(), "maintenance.json"):
-        files_created += 1
+    files_created = 0
+    for filename, default_data in files.items():
+        if init_data_file(data_dir / filename, default_data, filename):
+            files_created += 1
 
     if files_created > 0:
         logger.info(f"Initialization complete: {files_created} default file(s) created")
@@ -197,8 +194,7 @@ def reset_to_defaults(data_dir: Path = Path("/data")) -> None:
     for filename, default_data in files.items():
         file_path = data_dir / filename
         try:
-            with open(file_path, 'w') as f:
-                json.dump(default_data, f, indent=2)
+            file_path.write_bytes(json_utils.dumps(default_data, indent=True))
             logger.info(f"Reset {filename} to defaults")
         except Exception as e:
             logger.error(f"Failed to reset {filename}: {e}")
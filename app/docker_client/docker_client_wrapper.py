@@ -3,38 +3,116 @@ Docker client wrapper for container operations
 Provides interface to Docker API for monitoring and management
 """
 
+import aiohttp
+import asyncio
 import docker
 from docker.models.containers import Container
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Union, NamedTuple
+from urllib.parse import urlsplit
 import logging
-import requests
-import socket
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Container event actions and the status they leave the container in
+STATE_EVENT_ACTIONS = {
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+}
+
+
+class ParsedEndpoint(NamedTuple):
+    """HTTP health check endpoint split once, so probes only substitute the container IP"""
+    scheme: str
+    host: str
+    port: Optional[int]
+    path: str  # Path including any "?query"
+    local: bool  # Host is localhost/127.0.0.1 and should be replaced by the container IP
+
+    def url_for(self, ip_address: str) -> str:
+        """Build the probe URL for a container IP"""
+        host = ip_address if self.local else self.host
+        if ":" in host:
+            host = f"[{host}]"  # IPv6 literal
+        if self.port:
+            return f"{self.scheme}://{host}:{self.port}{self.path}"
+        return f"{self.scheme}://{host}{self.path}"
+
+
+@lru_cache(maxsize=256)
+def parse_endpoint(endpoint: str) -> ParsedEndpoint:
+    """
+    Parse an HTTP health check endpoint (cached per endpoint string)
+    Args:
+        endpoint: Configured endpoint, e.g. "http://localhost:3131/health"
+    Returns:
+        ParsedEndpoint
+    """
+    parts = urlsplit(endpoint)
+    host = parts.hostname or ""
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return ParsedEndpoint(
+        scheme=parts.scheme or "http",
+        host=host,
+        port=parts.port,
+        path=path,
+        local=host in ("localhost", "127.0.0.1")
+    )
+
 
 class DockerClientWrapper:
     """Wrapper around Docker SDK client with retry logic"""
 
-    def __init__(self, base_url: str = "unix://var/run/docker.sock"):
+    def __init__(self, base_url: str = "unix://var/run/docker.sock", max_pool_size: int = 32,
+                 info_ttl: float = 1.0, max_concurrent_restarts: int = 8, event_max_age: float = 30.0):
         """
         Initialize Docker client
         Args:
             base_url: Docker daemon socket URL
+            max_pool_size: Keep-alive connections kept open to the daemon
+            info_ttl: Seconds a get_container_info result is reused before inspecting again
+            max_concurrent_restarts: Restarts allowed in flight at once via restart_container_async
+            event_max_age: Upper bound in seconds on serving info for event-tracked containers
         """
         self.base_url = base_url
+        self.max_pool_size = max_pool_size
+        self.info_ttl = info_ttl
+        self.event_max_age = event_max_age
+        self._restart_semaphore = asyncio.Semaphore(max_concurrent_restarts)
+        # get_container_info results keyed by full container ID: (monotonic timestamp, info)
+        self._info_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        # Latest state pushed by the Docker events stream, keyed by full container ID
+        self._state_cache: Dict[str, Dict[str, Any]] = {}
+        # Guards both caches: the events thread, to_thread workers and the loop all touch them
+        self._cache_lock = threading.RLock()
         self._client: Optional[docker.DockerClient] = None
+        # Shared HTTP session for health checks, created lazily inside the event loop
+        self._http: Optional[aiohttp.ClientSession] = None
         self._connect()
 
     def _connect(self) -> None:
         """Connect to Docker daemon with retry logic"""
+        if self._client:
+            # Release the old connection pool before replacing the client
+            try:
+                self._client.close()
+            except Exception:
+                pass
+
         try:
-            self._client = docker.DockerClient(base_url=self.base_url)
+            # One pooled client for every caller; concurrent to_thread calls share its keep-alive connections
+            self._client = docker.DockerClient(base_url=self.base_url, max_pool_size=self.max_pool_size)
             # Test connection
             self._client.ping()
-            logger.info(f"Connected to Docker daemon at {self.base_url}")
+            logger.info("Connected to Docker daemon at %s", self.base_url)
         except Exception as e:
-            logger.error(f"Failed to connect to Docker daemon: {e}")
+            logger.error("Failed to connect to Docker daemon: %s", e)
             raise
 
     def reconnect(self) -> bool:
@@ -43,7 +121,7 @@ class DockerClientWrapper:
             self._connect()
             return True
         except Exception as e:
-            logger.error(f"Reconnection failed: {e}")
+            logger.error("Reconnection failed: %s", e)
             return False
 
     def is_connected(self) -> bool:
@@ -53,25 +131,63 @@ class DockerClientWrapper:
                 self._client.ping()
                 return True
         except Exception as e:
-            logger.warning(f"Connection check failed: {e}")
+            logger.warning("Connection check failed: %s", e)
         return False
 
-    def list_containers(self, all_containers: bool = False) -> List[Container]:
+    def list_containers(self, all_containers: bool = False, *,
+                        filters: Optional[Dict[str, Any]] = None) -> List[Container]:
         """
         List containers
         Args:
             all_containers: If True, list all containers including stopped ones
+            filters: Daemon-side filters, e.g. {"label": "autoheal=true"}
         Returns:
             List of Container objects
         """
         try:
-            return self._client.containers.list(all=all_containers)
+            return self._client.containers.list(all=all_containers, filters=filters or {})
         except Exception as e:
-            logger.error(f"Failed to list containers: {e}")
-            if not self.is_connected():
-                self.reconnect()
+            # Reconnection is handled by the monitoring loop's connection check
+            logger.error("Failed to list containers: %s", e)
             return []
 
+    async def get_container_ip(self, container: Container) -> Optional[str]:
+        """
+        Get a container IP address from its inspect attributes, inspecting only if they are missing
+        Args:
+            container: Container object (containers.list() and containers.get() already inspect)
+        Returns:
+            IP address (default bridge first, then host, then any other network), or None
+        """
+        if "NetworkSettings" not in container.attrs:
+            # Sparse list summaries lack the inspect payload
+            await asyncio.to_thread(container.reload)
+
+        network_settings = container.attrs.get("NetworkSettings") or {}
+
+        # Containers on the default bridge carry the address at the top level
+        ip_address = network_settings.get("IPAddress")
+        if ip_address:
+            return ip_address
+
+        # Deterministic order when attached to several networks
+        networks = network_settings.get("Networks") or {}
+        for preferred in ("bridge", "host"):
+            ip_address = (networks.get(preferred) or {}).get("IPAddress")
+            if ip_address:
+                return ip_address
+        return next((info["IPAddress"] for info in networks.values() if info.get("IPAddress")), None)
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the shared health check HTTP session, creating it on first use"""
+        if self._http is None or self._http.closed:
+            # One connector for every probe: pooled keep-alive sockets and cached DNS lookups
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=5),
+                connector=aiohttp.TCPConnector(limit=128, ttl_dns_cache=300)
+            )
+        return self._http
+
     def get_container(self, container_id: str) -> Optional[Container]:
         """
         Get container by ID or name
@@ -83,26 +199,36 @@ class DockerClientWrapper:
         try:
             return self._client.containers.get(container_id)
         except docker.errors.NotFound:
-            logger.warning(f"Container {container_id} not found")
+            logger.warning("Container %s not found", container_id)
             return None
         except Exception as e:
-            logger.error(f"Failed to get container {container_id}: {e}")
+            logger.error("Failed to get container %s: %s", container_id, e)
             return None
 
-    def get_container_info(self, container: Container) -> Dict[str, Any]:
+    def get_container_info(self, container: Container, skip_reload: bool = False) -> Dict[str, Any]:
         """
         Get detailed container information
         Args:
             container: Container object
+            skip_reload: Use the container's current attrs when the caller has just reloaded it
         Returns:
             Dictionary with container details
         """
         try:
-            container.reload()  # Refresh container state
+            inspected_at = time.monotonic()
+            if not skip_reload:
+                with self._cache_lock:
+                    ts, cached = self._info_cache.get(container.id, (0.0, None))
+                    if cached is not None and self._is_info_fresh(container.id, ts, inspected_at):
+                        return dict(cached)  # Callers may annotate the dict, keep the cached one intact
+                container.reload()  # Refresh container state
             attrs = container.attrs
 
-            # Extract relevant information
-            labels = attrs.get("Config", {}).get("Labels", {})
+            # Extract relevant information (each subtree looked up once)
+            state = attrs.get("State") or {}
+            config = attrs.get("Config") or {}
+            host_config = attrs.get("HostConfig") or {}
+            labels = config.get("Labels") or {}
 
             # Get stable identifier with same logic as monitoring_engine
             # Priority 1: Explicit monitoring.id label
@@ -118,12 +244,12 @@ class DockerClientWrapper:
                     # Priority 3: Container name (fallback)
                     stable_id = container.name
 
-            # Get image info for tracking
-            image_name = container.image.tags[0] if container.image.tags else container.image.id
+            # Get image info for tracking (from the inspect payload, container.image costs another request)
             image_id = attrs.get("Image", "")
+            image_name = config.get("Image") or image_id
 
             # Get network info for uniqueness
-            networks = list(attrs.get("NetworkSettings", {}).get("Networks", {}).keys())
+            networks = list(((attrs.get("NetworkSettings") or {}).get("Networks") or {}).keys())
 
             info = {
                 "id": container.id[:12],  # Short ID
@@ -133,28 +259,104 @@ class DockerClientWrapper:
                 "image": image_name,
                 "image_id": image_id,  # NEW: For version tracking
                 "status": container.status,
-                "state": attrs.get("State", {}),
+                "state": state,
                 "labels": labels,
                 "networks": networks,  # NEW: For handling name conflicts
                 "created": attrs.get("Created"),
-                "started_at": attrs.get("State", {}).get("StartedAt"),
-                "finished_at": attrs.get("State", {}).get("FinishedAt"),
-                "exit_code": attrs.get("State", {}).get("ExitCode"),
-                "restart_count": attrs.get("State", {}).get("RestartCount", 0),
-                "health": self._get_health_status(attrs),
-                "restart_policy": attrs.get("HostConfig", {}).get("RestartPolicy", {}),
+                "started_at": state.get("StartedAt"),
+                "finished_at": state.get("FinishedAt"),
+                "exit_code": state.get("ExitCode"),
+                # The Engine API reports RestartCount at the top level of the inspect payload, not in State
+                "restart_count": attrs.get("RestartCount", 0),
+                "health": self._get_health_status(state),
+                "restart_policy": host_config.get("RestartPolicy") or {},
                 "compose_project": labels.get("com.docker.compose.project"),  # NEW: Compose project
                 "compose_service": labels.get("com.docker.compose.service"),  # NEW: Compose service
             }
 
-            return info
+            with self._cache_lock:
+                self._info_cache[container.id] = (inspected_at, info)
+            return dict(info)
         except Exception as e:
-            logger.error(f"Failed to get container info for {container.name}: {e}")
+            logger.error("Failed to get container info for %s: %s", container.name, e)
             return {}
 
-    def _get_health_status(self, attrs: Dict) -> Optional[Dict[str, Any]]:
-        """Extract health status from container attributes"""
-        state = attrs.get("State", {})
+    def _is_info_fresh(self, container_id: str, ts: float, now: float) -> bool:
+        """
+        Check whether cached info can still be served (caller holds _cache_lock)
+        Containers tracked by the events stream stay cached until an event arrives or
+        event_max_age passes (a stalled stream must not freeze them), everything else
+        expires after info_ttl.
+        """
+        age = now - ts
+        state = self._state_cache.get(container_id)
+        if state is not None and ts > state["updated"] and age < self.event_max_age:
+            return True
+        return age < self.info_ttl
+
+    def invalidate_container(self, container_id: str) -> None:
+        """Drop cached info for a container so the next lookup inspects it again"""
+        with self._cache_lock:
+            self._info_cache.pop(container_id, None)
+
+    def prune_caches(self, container_ids: List[str]) -> None:
+        """Drop cached info and event state for containers no longer present"""
+        active = set(container_ids)
+        with self._cache_lock:
+            for cache in (self._info_cache, self._state_cache):
+                for container_id in [cid for cid in cache if cid not in active]:
+                    del cache[container_id]
+
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        """
+        Update the event-driven container state map from a Docker container or network event
+        Args:
+            event: Decoded Docker event
+        """
+        if event.get("Type") == "network":
+            # connect/disconnect change the container's networks; the container is an event attribute
+            container_id = ((event.get("Actor") or {}).get("Attributes") or {}).get("container")
+            if container_id:
+                self.invalidate_container(container_id)
+            return
+
+        container_id = event.get("id")
+        action = event.get("Action") or event.get("status") or ""
+        if not container_id:
+            return
+
+        if action.startswith("health_status"):
+            # e.g. "health_status: unhealthy"
+            update = {"health": action.partition(":")[2].strip()}
+        elif action in STATE_EVENT_ACTIONS:
+            update = {"status": STATE_EVENT_ACTIONS[action]}
+        else:
+            update = None
+
+        with self._cache_lock:
+            # Any container event (rename, update, kill, ...) may change what get_container_info reports
+            self._info_cache.pop(container_id, None)
+
+            if action == "destroy":
+                self._state_cache.pop(container_id, None)
+            elif update:
+                entry = self._state_cache.setdefault(container_id, {})
+                entry.update(update)
+                entry["updated"] = time.monotonic()
+
+    def get_container_state(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the last state pushed by the events stream, or None if never seen"""
+        with self._cache_lock:
+            state = self._state_cache.get(container_id)
+            return dict(state) if state is not None else None
+
+    def reset_event_state(self) -> None:
+        """Forget event-driven state, used when the events stream (re)connects and may have missed deltas"""
+        with self._cache_lock:
+            self._state_cache.clear()
+
+    def _get_health_status(self, state: Dict) -> Optional[Dict[str, Any]]:
+        """Extract health status from the container's State attributes"""
         health = state.get("Health")
 
         if health:
@@ -175,13 +377,28 @@ class DockerClientWrapper:
             True if restart successful, False otherwise
         """
         try:
-            logger.info(f"Restarting container {container.name} ({container.id[:12]})")
+            logger.info("Restarting container %s (%s)", container.name, container.id[:12])
             container.restart(timeout=timeout)
+            self.invalidate_container(container.id)
             return True
         except Exception as e:
-            logger.error(f"Failed to restart container {container.name}: {e}")
+            logger.error("Failed to restart container %s: %s", container.name, e)
             return False
 
+    async def restart_container_async(self, container: Container, timeout: int = 10) -> bool:
+        """
+        Restart a container without blocking the event loop
+        Concurrent callers are bounded by max_concurrent_restarts so a burst of
+        failures doesn't flood the daemon.
+        Args:
+            container: Container object
+            timeout: Timeout in seconds
+        Returns:
+            True if restart successful, False otherwise
+        """
+        async with self._restart_semaphore:
+            return await asyncio.to_thread(self.restart_container, container, timeout)
+
     def stop_container(self, container: Container, timeout: int = 10) -> bool:
         """
         Stop a container
@@ -192,64 +409,53 @@ class DockerClientWrapper:
             True if stop successful, False otherwise
         """
         try:
-            logger.info(f"Stopping container {container.name} ({container.id[:12]})")
+            logger.info("Stopping container %s (%s)", container.name, container.id[:12])
             container.stop(timeout=timeout)
+            self.invalidate_container(container.id)
             return True
         except Exception as e:
-            logger.error(f"Failed to stop container {container.name}: {e}")
+            logger.error("Failed to stop container %s: %s", container.name, e)
             return False
 
-    def execute_command(self, container: Container, command: List[str]) -> tuple[int, str]:
+    def execute_command(self, container: Container, command: List[str], *,
+                        decode: bool = True) -> tuple[int, Union[str, bytes]]:
         """
         Execute command in container
         Args:
             container: Container object
             command: Command to execute as list
+            decode: Decode output as UTF-8; pass False to get the raw bytes
         Returns:
             Tuple of (exit_code, output)
         """
         try:
             exec_result = container.exec_run(command)
+            if not decode:
+                return exec_result.exit_code, exec_result.output
             return exec_result.exit_code, exec_result.output.decode('utf-8')
         except Exception as e:
-            logger.error(f"Failed to execute command in container {container.name}: {e}")
+            logger.error("Failed to execute command in container %s: %s", container.name, e)
             return -1, str(e)
 
-    def check_http_health(self, container: Container, endpoint: str,
-                         expected_status: int = 200, timeout: int = 5) -> bool:
+    async def check_http_health(self, ip_address: str, parsed: ParsedEndpoint,
+                                expected_status: int = 200, timeout: int = 5) -> bool:
         """
         Perform HTTP health check on container
         Args:
-            container: Container object
-            endpoint: HTTP endpoint to check (e.g., "http://localhost:3131/health")
+            ip_address: Container IP address
+            parsed: Endpoint from parse_endpoint(); a localhost host is replaced by the container IP
             expected_status: Expected HTTP status code
             timeout: Request timeout
         Returns:
             True if health check passes, False otherwise
         """
+        url = parsed.url_for(ip_address)
         try:
-            # Get container's network settings
-            container.reload()
-            networks = container.attrs.get("NetworkSettings", {}).get("Networks", {})
-
-            # Try to get IP address from any network
-            ip_address = None
-            for network_name, network_info in networks.items():
-                ip_address = network_info.get("IPAddress")
-                if ip_address:
-                    break
-
-            if not ip_address:
-                logger.warning(f"Cannot get IP address for container {container.name}")
-                return False
-
-            # Replace localhost/127.0.0.1 with container IP
-            endpoint = endpoint.replace("localhost", ip_address).replace("127.0.0.1", ip_address)
-
-            response = requests.get(endpoint, timeout=timeout)
-            return response.status_code == expected_status
+            session = self._get_http_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                return response.status == expected_status
         except Exception as e:
-            logger.warning(f"HTTP health check failed for {container.name}: {e}")
+            logger.warning("HTTP health check failed for %s: %s", url, e)
             return False
 
     def get_events(self, decode=True, filters=None):
@@ -264,41 +470,29 @@ class DockerClientWrapper:
         try:
             return self._client.events(decode=decode, filters=filters)
         except Exception as e:
-            logger.error(f"Failed to get events stream: {e}")
+            logger.error("Failed to get events stream: %s", e)
             return None
 
-    def check_tcp_health(self, container: Container, port: int, timeout: int = 5) -> bool:
+    async def check_tcp_health(self, ip_address: str, port: int, timeout: int = 5) -> bool:
         """
         Perform TCP health check on container
         Args:
-            container: Container object
+            ip_address: Container IP address
             port: TCP port to check
             timeout: Connection timeout
         Returns:
             True if TCP connection successful, False otherwise
         """
         try:
-            container.reload()
-            networks = container.attrs.get("NetworkSettings", {}).get("Networks", {})
-
-            ip_address = None
-            for network_name, network_info in networks.items():
-                ip_address = network_info.get("IPAddress")
-                if ip_address:
-                    break
-
-            if not ip_address:
-                logger.warning(f"Cannot get IP address for container {container.name}")
-                return False
-
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex((ip_address, port))
-            sock.close()
-
-            return result == 0
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip_address, port, happy_eyeballs_delay=0.25),
+                timeout
+            )
+            writer.close()
+            await writer.wait_closed()
+            return True
         except Exception as e:
-            logger.warning(f"TCP health check failed for {container.name}: {e}")
+            logger.warning("TCP health check failed for %s:%s: %s", ip_address, port, e)
             return False
 
     def check_exec_health(self, container: Container, command: List[str]) -> bool:
@@ -310,7 +504,8 @@ class DockerClientWrapper:
         Returns:
             True if command exits with 0, False otherwise
         """
-        exit_code, _ = self.execute_command(container, command)
+        # Only the exit code matters, skip decoding the output
+        exit_code, _ = self.execute_command(container, command, decode=False)
         return exit_code == 0
 
     def get_docker_native_health(self, container: Container) -> Optional[str]:
@@ -323,17 +518,18 @@ class DockerClientWrapper:
         """
         try:
             container.reload()
-            info = self.get_container_info(container)
-            health = info.get("health")
-            if health:
-                return health.get("status")
-            return None
+            health = container.attrs.get("State", {}).get("Health")
+            return health.get("Status") if health else None
         except Exception as e:
-            logger.error(f"Failed to get native health for {container.name}: {e}")
+            logger.error("Failed to get native health for %s: %s", container.name, e)
             return None
 
-    def close(self) -> None:
-        """Close Docker client connection"""
+    async def close(self) -> None:
+        """Close Docker client connection and the health check HTTP session"""
+        if self._http:
+            await self._http.close()
+            self._http = None
+
         if self._client:
             self._client.close()
             logger.info("Docker client connection closed")
@@ -3,16 +3,21 @@ Main entry point for Docker Auto-Heal Service
 """
 
 import asyncio
+import atexit
 import logging
+import queue
 import signal
 import sys
+import threading
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 from pathlib import Path
 
 import uvicorn
 from prometheus_client import start_http_server, Counter, Gauge
 
-from app.config.config_manager import config_manager
+from app.config.config_manager import config_manager, AutoHealEvent
 from app.docker_client.docker_client_wrapper import DockerClientWrapper
 from app.monitor.monitoring_engine import MonitoringEngine
 from app.monitor.uptime_kuma_monitor import UptimeKumaMonitor
@@ -30,13 +35,26 @@ except Exception:
 
 LOG_FILE = LOG_DIR / "autoheal.log"
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# File writes happen on a background thread so logging never blocks the event loop
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+file_handler = RotatingFileHandler(str(LOG_FILE), maxBytes=10 * 1024 * 1024, backupCount=5)
+file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_listener: Optional[QueueListener] = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+
+# The listener's handler applies LOG_FORMAT; the queue side only renders the message
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 # Configure logging (will be updated with config)
 logging.basicConfig(
     level=logging.INFO,  # Default, will be updated
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler(str(LOG_FILE))
+        queue_handler
     ]
 )
 
@@ -44,6 +62,18 @@ logger = logging.getLogger(__name__)
 logger.info(f"Logging to: {LOG_FILE}")
 
 
+def stop_log_listener():
+    """Flush queued records to the log file and stop the writer thread"""
+    global log_listener
+    if log_listener:
+        log_listener.stop()
+        log_listener = None
+
+
+# Logging continues after service.stop() (API server, main()'s finally), so drain only at process exit
+atexit.register(stop_log_listener)
+
+
 class CancelledErrorFilter(logging.Filter):
     """Filter to suppress CancelledError from uvicorn.error logs during shutdown"""
     def filter(self, record):
@@ -67,6 +97,11 @@ def update_log_level(level_name: str):
     # Set root logger level
     logging.getLogger().setLevel(level)
 
+    # The log format doesn't use thread/process fields, skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Disable uvicorn access logs completely (set to WARNING to suppress INFO logs)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
@@ -75,14 +110,56 @@ def update_log_level(level_name: str):
     # Add filter to suppress CancelledError tracebacks
     logging.getLogger("uvicorn.error").addFilter(CancelledErrorFilter())
 
-    logger.info(f"Log level set to: {level_name}")
+    logger.info("Log level set to: %s", level_name)
 
 # Prometheus metrics
 container_restarts = Counter('autoheal_container_restarts_total', 'Total container restarts', ['container_name'])
 containers_monitored = Gauge('autoheal_containers_monitored', 'Number of containers being monitored')
 containers_quarantined = Gauge('autoheal_containers_quarantined', 'Number of quarantined containers')
 health_checks_total = Counter('autoheal_health_checks_total', 'Total health checks performed')
-health_checks_failed = Counter('autoheal_health_checks_failed', 'Failed health checks', ['container_name'])
+# No per-container label: container names are only exported through the bounded restart counter
+health_checks_failed = Counter('autoheal_health_checks_failed', 'Failed health checks')
+
+# Upper bound on distinct container_name values kept per labelled metric
+MAX_METRIC_LABELS = 256
+
+
+class BoundedLabels:
+    """
+    Hands out container_name children of a labelled metric, removing the least
+    recently used one once max_labels is reached so recreated containers with
+    generated names can't grow the metric without bound
+    """
+
+    def __init__(self, metric, max_labels: int = MAX_METRIC_LABELS):
+        self._metric = metric
+        self._max_labels = max_labels
+        self._names: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def labels(self, container_name: str):
+        """Get the metric child for a container name"""
+        with self._lock:
+            if container_name in self._names:
+                self._names.move_to_end(container_name)
+            else:
+                if len(self._names) >= self._max_labels:
+                    evicted, _ = self._names.popitem(last=False)
+                    self._metric.remove(evicted)
+                self._names[container_name] = None
+            return self._metric.labels(container_name=container_name)
+
+
+container_restarts_by_name = BoundedLabels(container_restarts)
+
+
+def record_event_metrics(event: AutoHealEvent) -> None:
+    """Update Prometheus metrics from auto-heal events"""
+    if event.event_type == "restart" and event.status == "success":
+        container_restarts_by_name.labels(event.docker_name or event.container_name).inc()
+
+
+config_manager.add_event_listener(record_event_metrics)
 
 
 class AutoHealService:
@@ -94,6 +171,7 @@ class AutoHealService:
         self.notification_manager = notification_manager
         self.uptime_kuma_monitor: Optional[UptimeKumaMonitor] = None
         self.running = False
+        self._stop_event = asyncio.Event()
 
     async def start(self):
         """Start the auto-heal service"""
@@ -110,7 +188,8 @@ class AutoHealService:
 
             # Initialize Docker client
             logger.info("Connecting to Docker daemon...")
-            self.docker_client = DockerClientWrapper()
+            # Event-tracked container info is re-inspected at least once per monitoring interval
+            self.docker_client = DockerClientWrapper(event_max_age=config.monitor.interval_seconds)
             logger.info("Docker client connected successfully")
 
             # Initialize monitoring engine
@@ -167,6 +246,7 @@ class AutoHealService:
         logger.info("Stopping Docker Auto-Heal Service...")
 
         self.running = False
+        self._stop_event.set()
 
         # Stop components gracefully with error handling
         if self.uptime_kuma_monitor:
@@ -183,7 +263,7 @@ class AutoHealService:
 
         if self.docker_client:
             try:
-                self.docker_client.close()
+                await self.docker_client.close()
             except Exception as e:
                 logger.warning(f"Error closing Docker client: {e}")
 
@@ -195,8 +275,7 @@ class AutoHealService:
 
         # Keep running until stopped
         try:
-            while self.running:
-                await asyncio.sleep(1)
+            await self._stop_event.wait()
         except asyncio.CancelledError:
             pass
         finally:
@@ -205,17 +284,22 @@ class AutoHealService:
 
 # Global service instance
 service: Optional[AutoHealService] = None
+api_server: Optional[uvicorn.Server] = None
 
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
+def signal_handler(signum):
+    """Handle shutdown signals (runs on the event loop)"""
     logger.info(f"Received signal {signum}, initiating shutdown...")
     if service:
-        asyncio.create_task(service.stop())
+        # run() performs the actual shutdown once woken
+        service._stop_event.set()
+    if api_server:
+        api_server.should_exit = True
 
 
 async def run_api_server():
     """Run FastAPI server"""
+    global api_server
     config = config_manager.get_config()
 
     # Map our log level to uvicorn format (lowercase)
@@ -231,17 +315,24 @@ async def run_api_server():
         log_config=None  # Use default logging config
     )
 
-    server = uvicorn.Server(uvicorn_config)
-    await server.serve()
+    api_server = uvicorn.Server(uvicorn_config)
+    # main() owns SIGINT/SIGTERM and stops the server from its handler
+    api_server.install_signal_handlers = lambda: None
+    await api_server.serve()
 
 
 async def main():
     """Main entry point"""
     global service
 
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Register signal handlers on the loop so setting the stop event wakes it immediately
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, signal_handler, sig)
+        except NotImplementedError:
+            # Windows: no loop signal support, hand the signal over to the loop thread-safely
+            signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(signal_handler, signum))
 
     # Create service instance
     service = AutoHealService()
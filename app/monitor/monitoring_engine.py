@@ -6,13 +6,13 @@ Monitors containers and performs auto-healing actions
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Dict, Any
 import fnmatch
 
 from docker.models.containers import Container
 
 from app.config.config_manager import config_manager, AutoHealEvent, HealthCheckConfig
-from app.docker_client.docker_client_wrapper import DockerClientWrapper
+from app.docker_client.docker_client_wrapper import DockerClientWrapper, parse_endpoint
 from app.notifications.notification_manager import notification_manager
 from app.notifications.notification_manager import notification_manager
 
@@ -103,7 +103,7 @@ class MonitoringEngine:
             except asyncio.CancelledError:
                 pass  # Expected during shutdown
             except Exception as e:
-                logger.warning(f"Error stopping monitor loop: {e}")
+                logger.warning("Error stopping monitor loop: %s", e)
 
         if self._event_task:
             self._event_task.cancel()
@@ -112,7 +112,7 @@ class MonitoringEngine:
             except asyncio.CancelledError:
                 pass  # Expected during shutdown
             except Exception as e:
-                logger.warning(f"Error stopping event listener: {e}")
+                logger.warning("Error stopping event listener: %s", e)
 
         logger.info("Monitoring engine stopped")
         logger.info("Event listener stopped")
@@ -133,50 +133,54 @@ class MonitoringEngine:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}", exc_info=True)
+                logger.error("Error in monitoring loop: %s", e, exc_info=True)
                 await asyncio.sleep(5)  # Brief pause before retry
 
     async def _check_containers(self) -> None:
         """Check all containers and perform auto-healing if needed"""
         try:
             # Ensure Docker connection is active
-            if not self.docker_client.is_connected():
+            if not await asyncio.to_thread(self.docker_client.is_connected):
                 logger.warning("Docker connection lost, attempting reconnect...")
-                if not self.docker_client.reconnect():
+                if not await asyncio.to_thread(self.docker_client.reconnect):
                     logger.error("Failed to reconnect to Docker")
                     return
 
-            # Get ALL containers (including stopped) to detect failures
+            # Get ALL containers (including stopped) to detect failures; list() inspects each one,
+            # so their attrs (state, networks) are fresh for the rest of this cycle
             containers = await asyncio.to_thread(self.docker_client.list_containers, all_containers=True)
 
+            # Forget cached info and event state for containers that are gone
+            self.docker_client.prune_caches([container.id for container in containers])
+
+            # Build info from the attrs list() just fetched, no second inspect per container
+            infos = [self.docker_client.get_container_info(container, skip_reload=True) for container in containers]
+
             # Get stable IDs for active containers to clean up restart counts
-            active_stable_ids = []
-            for container in containers:
-                try:
-                    info = self.docker_client.get_container_info(container)
-                    if info:
-                        stable_id = self.get_stable_identifier(info)
-                        active_stable_ids.append(stable_id)
-                except Exception as e:
-                    logger.debug(f"Error getting container info for cleanup: {e}")
+            active_stable_ids = [self.get_stable_identifier(info) for info in infos if info]
 
             # Clean up restart counts for removed containers
             config_manager.cleanup_restart_counts(active_stable_ids)
 
-            for container in containers:
-                try:
-                    await self._check_single_container(container)
-                except Exception as e:
-                    logger.error(f"Error checking container {container.name}: {e}")
+            # Check containers concurrently so slow health checks don't serialize the cycle
+            results = await asyncio.gather(
+                *(self._check_single_container(container, info) for container, info in zip(containers, infos)),
+                return_exceptions=True
+            )
+            for container, result in zip(containers, results):
+                if isinstance(result, Exception):
+                    logger.error("Error checking container %s: %s", container.name, result)
 
         except Exception as e:
-            logger.error(f"Error checking containers: {e}", exc_info=True)
+            logger.error("Error checking containers: %s", e, exc_info=True)
 
-    async def _check_single_container(self, container: Container) -> None:
+    async def _check_single_container(self, container: Container,
+                                      info: Optional[Dict[str, Any]] = None) -> None:
         """
         Check a single container and perform auto-healing if needed
         Args:
             container: Container object to check
+            info: Container info already built this cycle, fetched if not given
         """
         # Check if maintenance mode is enabled
         if config_manager.is_maintenance_mode():
@@ -186,7 +190,8 @@ class MonitoringEngine:
         config = config_manager.get_config()
 
         # Get container info
-        info = await asyncio.to_thread(self.docker_client.get_container_info, container)
+        if not info:
+            info = await asyncio.to_thread(self.docker_client.get_container_info, container)
         container_id = info.get("full_id")
         container_name = info.get("name")
 
@@ -220,7 +225,7 @@ class MonitoringEngine:
                     await self._auto_unquarantine_container(quarantine_id, stable_id, container_name, container_id)
                     return
 
-            logger.debug(f"Container {container_name} (stable_id: {stable_id}) is quarantined and still unhealthy, skipping")
+            logger.debug("Container %s (stable_id: %s) is quarantined and still unhealthy, skipping", container_name, stable_id)
             return
 
 
@@ -263,7 +268,7 @@ class MonitoringEngine:
             short_id in config.containers.selected or
             container_name in config.containers.selected or
             (compose_service and compose_service in config.containers.selected)):
-            logger.debug(f"Container {container_name} (stable_id: {stable_id}) explicitly selected for monitoring")
+            logger.debug("Container %s (stable_id: %s) explicitly selected for monitoring", container_name, stable_id)
             return True
 
         # Check include_all flag
@@ -335,7 +340,7 @@ class MonitoringEngine:
         status = state.get("Status", "").lower()
 
         if status == "starting":
-            logger.debug(f"Container {info.get('name')} is still starting, skipping health evaluation")
+            logger.debug("Container %s is still starting, skipping health evaluation", info.get('name'))
             return False, "Container is starting"
 
         if status in ["exited", "stopped", "dead"]:
@@ -345,7 +350,7 @@ class MonitoringEngine:
             if restart_mode in ["on-failure", "both"]:
                 # If exit code is 0 (clean stop) and we respect manual stops, don't restart
                 if exit_code == 0 and config.restart.respect_manual_stop:
-                    logger.debug(f"Container {info.get('name')} stopped cleanly (exit 0), respecting manual stop")
+                    logger.debug("Container %s stopped cleanly (exit 0), respecting manual stop", info.get('name'))
                     return False, "Manual stop (exit 0)"
 
                 # For non-zero exit codes or if we don't respect manual stops, restart
@@ -398,18 +403,23 @@ class MonitoringEngine:
         check_type = health_check.check_type
 
         try:
+            if check_type in ("http", "tcp"):
+                # Resolved from the attrs containers.list() fetched this cycle
+                ip_address = await self.docker_client.get_container_ip(container)
+                if not ip_address:
+                    logger.warning("Cannot get IP address for container %s", container.name)
+                    return False
+
             if check_type == "http":
-                return await asyncio.to_thread(
-                    self.docker_client.check_http_health,
-                    container,
-                    health_check.http_endpoint,
+                return await self.docker_client.check_http_health(
+                    ip_address,
+                    parse_endpoint(health_check.http_endpoint),
                     health_check.http_expected_status,
                     health_check.timeout_seconds
                 )
             elif check_type == "tcp":
-                return await asyncio.to_thread(
-                    self.docker_client.check_tcp_health,
-                    container,
+                return await self.docker_client.check_tcp_health(
+                    ip_address,
                     health_check.tcp_port,
                     health_check.timeout_seconds
                 )
@@ -426,10 +436,10 @@ class MonitoringEngine:
                 )
                 return status == "healthy" if status else True  # Assume healthy if no check
             else:
-                logger.warning(f"Unknown health check type: {check_type}")
+                logger.warning("Unknown health check type: %s", check_type)
                 return True
         except Exception as e:
-            logger.error(f"Error performing health check: {e}")
+            logger.error("Error performing health check: %s", e)
             return False
 
     async def _auto_unquarantine_container(self, quarantine_id: str, stable_id: str,
@@ -469,10 +479,10 @@ class MonitoringEngine:
             # Send notification
             await notification_manager.send_event_notification(event)
 
-            logger.info(f"Container {container_name} (stable_id: {stable_id}) automatically removed from quarantine - container auto-healed")
+            logger.info("Container %s (stable_id: %s) automatically removed from quarantine - container auto-healed", container_name, stable_id)
 
         except Exception as e:
-            logger.error(f"Error auto-unquarantining container {container_name}: {e}")
+            logger.error("Error auto-unquarantining container %s: %s", container_name, e)
 
     async def _handle_container_restart(self, container: Container, info: dict, reason: str) -> None:
         """
@@ -496,14 +506,14 @@ class MonitoringEngine:
         # 2. Auto-generated names (uses compose service name)
         # 3. Name conflicts (uses compose project + service)
 
-        logger.debug(f"Using stable_id '{stable_id}' for container {container_name}")
+        logger.debug("Using stable_id '%s' for container %s", stable_id, container_name)
 
         # Check cooldown (using stable_id)
         last_restart = self._last_restart_times.get(stable_id)
         if last_restart:
             elapsed = (datetime.now(timezone.utc) - last_restart).total_seconds()
             if elapsed < config.restart.cooldown_seconds:
-                logger.debug(f"Container {container_name} (stable_id: {stable_id}) in cooldown period ({elapsed:.1f}s)")
+                logger.debug("Container %s (stable_id: %s) in cooldown period (%.1fs)", container_name, stable_id, elapsed)
                 return
 
         # Check restart threshold (using stable_id for persistence)
@@ -531,7 +541,7 @@ class MonitoringEngine:
             # Send notification for quarantine event
             await notification_manager.send_event_notification(event)
 
-            logger.warning(f"Container {container_name} (stable_id: {stable_id}) quarantined after {restart_count} restarts")
+            logger.warning("Container %s (stable_id: %s) quarantined after %s restarts", container_name, stable_id, restart_count)
 
             # Send alert if configured
             if config.alerts.enabled and config.alerts.notify_on_quarantine:
@@ -542,7 +552,7 @@ class MonitoringEngine:
         # Apply backoff if enabled (using stable_id)
         if config.restart.backoff.enabled:
             backoff_delay = self._backoff_delays.get(stable_id, config.restart.backoff.initial_seconds)
-            logger.debug(f"Applying backoff delay of {backoff_delay}s for {container_name} (stable_id: {stable_id})")
+            logger.debug("Applying backoff delay of %ss for %s (stable_id: %s)", backoff_delay, container_name, stable_id)
             await asyncio.sleep(backoff_delay)
 
             # Update backoff for next time
@@ -550,8 +560,8 @@ class MonitoringEngine:
             self._backoff_delays[stable_id] = next_backoff
 
         # Perform restart
-        logger.info(f"Restarting container {container_name} (stable_id: {stable_id}, reason: {reason})")
-        success = await asyncio.to_thread(self.docker_client.restart_container, container)
+        logger.info("Restarting container %s (stable_id: %s, reason: %s)", container_name, stable_id, reason)
+        success = await self.docker_client.restart_container_async(container)
 
         # Record restart (using stable_id - persists across ID changes and handles all edge cases)
         config_manager.record_restart(stable_id)
@@ -565,7 +575,8 @@ class MonitoringEngine:
             event_type="restart",
             restart_count=restart_count + 1,
             status="success" if success else "failure",
-            message=f"Restart {'successful' if success else 'failed'}: {reason}"
+            message=f"Restart {'successful' if success else 'failed'}: {reason}",
+            docker_name=container_name
         )
         config_manager.add_event(event)
 
@@ -573,11 +584,11 @@ class MonitoringEngine:
         await notification_manager.send_event_notification(event)
 
         if success:
-            logger.info(f"Successfully restarted container {container_name} (stable_id: {stable_id})")
+            logger.info("Successfully restarted container %s (stable_id: %s)", container_name, stable_id)
             # Reset backoff on successful restart
             self._backoff_delays[stable_id] = config.restart.backoff.initial_seconds
         else:
-            logger.error(f"Failed to restart container {container_name} (stable_id: {stable_id})")
+            logger.error("Failed to restart container %s (stable_id: %s)", container_name, stable_id)
 
     async def _send_alert(self, event: AutoHealEvent) -> None:
         """
@@ -612,12 +623,12 @@ class MonitoringEngine:
             )
 
             if response.status_code == 200:
-                logger.info(f"Alert sent successfully for {event.container_name}")
+                logger.info("Alert sent successfully for %s", event.container_name)
             else:
-                logger.warning(f"Alert webhook returned status {response.status_code}")
+                logger.warning("Alert webhook returned status %s", response.status_code)
 
         except Exception as e:
-            logger.error(f"Failed to send alert: {e}")
+            logger.error("Failed to send alert: %s", e)
 
     def get_status(self) -> dict:
         """Get monitoring engine status"""
@@ -636,12 +647,16 @@ class MonitoringEngine:
             logger.info("Scanning existing containers for autoheal=true label...")
 
             # Ensure Docker connection is active
-            if not self.docker_client.is_connected():
+            if not await asyncio.to_thread(self.docker_client.is_connected):
                 logger.warning("Docker connection not available for initial scan")
                 return
 
-            # Get all running containers
-            containers = await asyncio.to_thread(self.docker_client.list_containers, all_containers=False)
+            # Get running containers with the autoheal=true label (filtered by the daemon)
+            containers = await asyncio.to_thread(
+                self.docker_client.list_containers,
+                all_containers=False,
+                filters={"label": "autoheal=true"}
+            )
 
             added_count = 0
             config = config_manager.get_config()
@@ -682,14 +697,14 @@ class MonitoringEngine:
                     if (stable_id in config.containers.selected or
                         container_name in config.containers.selected or
                         container_id in config.containers.selected):
-                        logger.debug(f"Container {container_name} (stable_id: {stable_id}) already in monitored list")
+                        logger.debug("Container %s (stable_id: %s) already in monitored list", container_name, stable_id)
                         continue
 
                     # Check if in excluded list
                     if (stable_id in config.containers.excluded or
                         container_name in config.containers.excluded or
                         container_id in config.containers.excluded):
-                        logger.info(f"Container {container_name} (stable_id: {stable_id}) has autoheal=true but is in excluded list, skipping")
+                        logger.info("Container %s (stable_id: %s) has autoheal=true but is in excluded list, skipping", container_name, stable_id)
                         continue
 
                     # Add to monitored list using STABLE ID
@@ -697,7 +712,7 @@ class MonitoringEngine:
                     added_count += 1
 
                     # Log the auto-monitoring
-                    logger.info(f"Auto-monitoring enabled for container '{container_name}' ({container_id[:12]}) with stable_id '{stable_id}' - detected autoheal=true label on startup")
+                    logger.info("Auto-monitoring enabled for container '%s' (%s) with stable_id '%s' - detected autoheal=true label on startup", container_name, container_id[:12], stable_id)
 
                     # Create an event for this
                     event_obj = AutoHealEvent(
@@ -715,28 +730,28 @@ class MonitoringEngine:
                     await notification_manager.send_event_notification(event_obj)
 
                 except Exception as e:
-                    logger.error(f"Error processing container during initial scan: {e}", exc_info=True)
+                    logger.error("Error processing container during initial scan: %s", e, exc_info=True)
                     continue
 
             # Save configuration if any containers were added
             if added_count > 0:
                 config_manager.update_config(config)
-                logger.info(f"Initial scan complete: {added_count} container(s) auto-added to monitoring")
+                logger.info("Initial scan complete: %s container(s) auto-added to monitoring", added_count)
             else:
                 logger.info("Initial scan complete: no new containers to add")
 
         except Exception as e:
-            logger.error(f"Error during initial container scan: {e}", exc_info=True)
+            logger.error("Error during initial container scan: %s", e, exc_info=True)
 
     async def _event_listener_loop(self) -> None:
         """
         Listen for Docker events and auto-add containers with autoheal=true label
         """
         import threading
-        import queue
 
-        # Queue for events from the blocking thread
-        event_queue = queue.Queue()
+        # Queue for events from the blocking thread, fed via the loop so awaiting it never blocks
+        loop = asyncio.get_running_loop()
+        event_queue: asyncio.Queue = asyncio.Queue()
 
         def event_thread():
             """Thread function to read events from Docker (blocking)"""
@@ -744,10 +759,11 @@ class MonitoringEngine:
                 try:
                     logger.debug("Starting Docker event listener thread...")
 
-                    # Get event stream (blocking generator)
+                    # Get event stream (blocking generator). All container and network events feed
+                    # the wrapper's caches; only start events need async processing here
                     events = self.docker_client.get_events(
                         decode=True,
-                        filters={"type": "container", "event": "start"}
+                        filters={"type": ["container", "network"]}
                     )
 
                     if not events:
@@ -756,14 +772,20 @@ class MonitoringEngine:
                         time.sleep(10)
                         continue
 
+                    # Events may have been missed while disconnected
+                    self.docker_client.reset_event_state()
+
                     # Read events and put them in queue
                     for event in events:
                         if not self._running:
                             break
-                        event_queue.put(event)
+                        self.docker_client.apply_event(event)
+                        if event.get("Type", "container") == "container" and event.get("Action") == "start":
+                            loop.call_soon_threadsafe(event_queue.put_nowait, event)
 
                 except Exception as e:
-                    logger.error(f"Error in event listener thread: {e}", exc_info=True)
+                    logger.error("Error in event listener thread: %s", e, exc_info=True)
+                    self.docker_client.reset_event_state()
                     import time
                     time.sleep(10)
 
@@ -777,17 +799,17 @@ class MonitoringEngine:
             try:
                 # Check queue with timeout to allow loop to continue
                 try:
-                    event = event_queue.get(timeout=1.0)
+                    event = await asyncio.wait_for(event_queue.get(), timeout=1.0)
                     await self._process_container_start_event(event)
-                except queue.Empty:
+                except asyncio.TimeoutError:
                     # No events, continue loop
-                    await asyncio.sleep(0.1)
+                    continue
 
             except asyncio.CancelledError:
                 logger.debug("Event listener cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error processing event from queue: {e}", exc_info=True)
+                logger.error("Error processing event from queue: %s", e, exc_info=True)
                 await asyncio.sleep(1)
 
     async def _process_container_start_event(self, event: dict) -> None:
@@ -806,7 +828,7 @@ class MonitoringEngine:
             if not container_id:
                 return
 
-            logger.debug(f"Container start event detected: {container_name} ({container_id[:12]})")
+            logger.debug("Container start event detected: %s (%s)", container_name, container_id[:12])
 
             # Get the container object
             container = await asyncio.to_thread(
@@ -815,7 +837,7 @@ class MonitoringEngine:
             )
 
             if not container:
-                logger.warning(f"Could not retrieve container {container_name} after start event")
+                logger.warning("Could not retrieve container %s after start event", container_name)
                 return
 
             # Get container info including labels
@@ -847,14 +869,14 @@ class MonitoringEngine:
                 if (stable_id in config.containers.selected or
                     container_name in config.containers.selected or
                     container_id in config.containers.selected):
-                    logger.debug(f"Container {container_name} (stable_id: {stable_id}) already in monitored list")
+                    logger.debug("Container %s (stable_id: %s) already in monitored list", container_name, stable_id)
                     return
 
                 # Check if in excluded list (by stable_id, name, or ID for backwards compatibility)
                 if (stable_id in config.containers.excluded or
                     container_name in config.containers.excluded or
                     container_id in config.containers.excluded):
-                    logger.info(f"Container {container_name} (stable_id: {stable_id}) has autoheal=true but is in excluded list, skipping")
+                    logger.info("Container %s (stable_id: %s) has autoheal=true but is in excluded list, skipping", container_name, stable_id)
                     return
 
                 # Add to monitored list using STABLE ID (solves all edge cases)
@@ -862,7 +884,7 @@ class MonitoringEngine:
                 config_manager.update_config(config)
 
                 # Log the auto-monitoring
-                logger.info(f"Auto-monitoring enabled for container '{container_name}' ({container_id[:12]}) with stable_id '{stable_id}' - detected autoheal=true label")
+                logger.info("Auto-monitoring enabled for container '%s' (%s) with stable_id '%s' - detected autoheal=true label", container_name, container_id[:12], stable_id)
 
                 # Create an event for this
                 event_obj = AutoHealEvent(
@@ -880,5 +902,5 @@ class MonitoringEngine:
                 await notification_manager.send_event_notification(event_obj)
 
         except Exception as e:
-            logger.error(f"Error processing container start event: {e}", exc_info=True)
+            logger.error("Error processing container start event: %s", e, exc_info=True)
 
@@ -46,10 +46,14 @@ class UptimeKumaMonitor:
                 logger.info("Uptime-Kuma integration not configured yet - visit http://localhost:3131/config to set up")
                 return
 
+            if self.client:
+                await self.client.close()
+
             self.client = UptimeKumaClient(
                 config.uptime_kuma.server_url,
                 config.uptime_kuma.api_token,  # password (API key or user password)
-                config.uptime_kuma.username    # username (optional, empty for API key)
+                config.uptime_kuma.username,   # username (optional, empty for API key)
+                cache_dir=config_manager.DATA_DIR
             )
 
             # Test connection
@@ -85,6 +89,9 @@ class UptimeKumaMonitor:
             except Exception as e:
                 logger.warning(f"Error stopping Uptime-Kuma task: {e}")
 
+        if self.client:
+            await self.client.close()
+
         logger.info("Uptime-Kuma monitoring stopped")
 
     async def _refresh_monitor_cache(self):
@@ -12,6 +12,18 @@ from datetime import datetime, timezone
 BASE_URL = "http://localhost:3131"
 API_URL = f"{BASE_URL}/api"
 
+# Shared session so every demo call reuses the keep-alive connection
+SESSION = requests.Session()
+
+# Pause between demo steps for readability, enabled with --pace
+PACE = False
+
+
+def pause(seconds):
+    """Sleep between demo steps only when pacing is enabled"""
+    if PACE:
+        time.sleep(seconds)
+
 
 def print_header(text):
     """Print a formatted header"""
@@ -24,7 +36,7 @@ def check_service_health():
     """Check if the service is running and healthy"""
     print_header("Checking Service Health")
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Service is healthy")
@@ -45,7 +57,7 @@ def get_system_status():
     """Get and display system status"""
     print_header("System Status")
     try:
-        response = requests.get(f"{API_URL}/status")
+        response = SESSION.get(f"{API_URL}/status")
         data = response.json()
 
         print(f"Total Containers: {data['total_containers']}")
@@ -64,7 +76,7 @@ def list_containers():
     """List all containers"""
     print_header("Container List")
     try:
-        response = requests.get(f"{API_URL}/containers")
+        response = SESSION.get(f"{API_URL}/containers")
         containers = response.json()
 
         if not containers:
@@ -95,7 +107,7 @@ def get_current_config():
     """Get and display current configuration"""
     print_header("Current Configuration")
     try:
-        response = requests.get(f"{API_URL}/config")
+        response = SESSION.get(f"{API_URL}/config")
         config = response.json()
 
         print("Monitor Settings:")
@@ -120,7 +132,7 @@ def view_events():
     """View recent events"""
     print_header("Recent Events")
     try:
-        response = requests.get(f"{API_URL}/events?limit=10")
+        response = SESSION.get(f"{API_URL}/events?limit=10")
         events = response.json()
 
         if not events:
@@ -145,7 +157,7 @@ def enable_autoheal_for_container(container_id):
     """Enable auto-heal for a specific container"""
     print_header(f"Enabling Auto-Heal for Container {container_id}")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_URL}/containers/select",
             json={
                 "container_ids": [container_id],
@@ -168,7 +180,7 @@ def add_http_health_check(container_id, endpoint, expected_status=200):
     """Add HTTP health check for a container"""
     print_header(f"Adding HTTP Health Check for {container_id}")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_URL}/healthchecks",
             json={
                 "container_id": container_id,
@@ -198,7 +210,7 @@ def export_config():
     """Export configuration to file"""
     print_header("Exporting Configuration")
     try:
-        response = requests.get(f"{API_URL}/config/export")
+        response = SESSION.get(f"{API_URL}/config/export")
 
         if response.status_code == 200:
             filename = f"config-backup-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.json"
@@ -227,23 +239,23 @@ def run_interactive_demo():
         print("   docker-compose up -d")
         return
 
-    time.sleep(1)
+    pause(1)
 
     # Get system status
     get_system_status()
-    time.sleep(1)
+    pause(1)
 
     # List containers
     containers = list_containers()
-    time.sleep(1)
+    pause(1)
 
     # Show current config
     get_current_config()
-    time.sleep(1)
+    pause(1)
 
     # View events
     view_events()
-    time.sleep(1)
+    pause(1)
 
     # Interactive menu
     while True:
@@ -292,7 +304,7 @@ def run_interactive_demo():
         else:
             print("❌ Invalid choice. Please try again.")
 
-        time.sleep(1)
+        pause(1)
 
 
 def run_automated_demo():
@@ -312,9 +324,9 @@ def run_automated_demo():
 
     for step_name, step_func in steps:
         print(f"\n▶️  {step_name}...")
-        time.sleep(1)
+        pause(1)
         step_func()
-        time.sleep(2)
+        pause(2)
 
     print("\n" + "=" * 60)
     print("  Demo Complete!")
@@ -323,11 +335,14 @@ def run_automated_demo():
     print(f"📚 API Docs: {BASE_URL}/docs")
     print(f"📊 Metrics: http://localhost:9090/metrics")
     print("\nFor interactive mode, run: python demo.py --interactive")
+    print("To pause between steps, add: --pace")
 
 
 if __name__ == "__main__":
     import sys
 
+    PACE = "--pace" in sys.argv
+
     if "--interactive" in sys.argv or "-i" in sys.argv:
         run_interactive_demo()
     else:
@@ -5,10 +5,55 @@ Demonstrates automatic container discovery based on autoheal=true label
 """
 
 import docker
+import json
 import time
 import requests
 from datetime import datetime
 
+EVENTS_URL = "http://localhost:3131/api/events"
+EVENTS_STREAM_URL = f"{EVENTS_URL}/stream"
+
+
+def iter_stream_events(response, timeout):
+    """
+    Yield auto-heal events from an open /api/events/stream response until timeout
+    The deadline is checked whenever a line arrives; the server sends keep-alive
+    comments while idle, so an idle stream overshoots by at most one keep-alive interval.
+    """
+    deadline = time.monotonic() + timeout
+    for line in response.iter_lines(decode_unicode=True):
+        if time.monotonic() > deadline:
+            return
+        if line and line.startswith("data: "):
+            yield json.loads(line[len("data: "):])
+
+
+def fetch_events(container_id, event_type):
+    """Fetch logged events for one container and event type from the filtered /api/events endpoint"""
+    response = requests.get(
+        EVENTS_URL, params={"container_id": container_id, "event_type": event_type}, timeout=5
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def wait_for_event(stream, container_id, event_type, timeout):
+    """
+    Wait until the API has logged an event of event_type for container_id
+    The stream only wakes the test up; matching is done by the filtered /api/events query.
+    Returns the latest matching event, or None after timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        events = fetch_events(container_id, event_type)
+        if events:
+            return events[-1]
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        next((e for e in iter_stream_events(stream, remaining) if e.get("event_type") == event_type), None)
+
+
 def test_auto_monitoring():
     """Test the auto-monitoring feature"""
 
@@ -23,6 +68,12 @@ def test_auto_monitoring():
     # Test container name
     test_container_name = "autoheal-test-nginx"
 
+    # Subscribe to the event stream before starting containers so no event is missed
+    try:
+        stream = requests.get(EVENTS_STREAM_URL, stream=True, timeout=30)
+    except requests.exceptions.ConnectionError:
+        stream = None
+
     try:
         # Step 1: Clean up any existing test container
         print("Step 1: Cleaning up any existing test containers...")
@@ -49,41 +100,26 @@ def test_auto_monitoring():
         print(f"  Labels: autoheal=true")
         print()
 
-        # Step 3: Wait for event processing
-        print("Step 3: Waiting for auto-monitoring event (5 seconds)...")
-        for i in range(5, 0, -1):
-            print(f"  {i}...", end="", flush=True)
-            time.sleep(1)
-        print(" Done!")
-        print()
-
-        # Step 4: Check if container was auto-monitored
-        print("Step 4: Verifying container was auto-monitored...")
+        # Step 3: Wait for the auto-monitoring event
+        print("Step 3: Waiting for auto-monitoring event on the event stream...")
         try:
-            # Query the autoheal API
-            response = requests.get("http://localhost:3131/api/events", timeout=5)
-            if response.status_code == 200:
-                events = response.json()
-
-                # Look for auto_monitor events for this container
-                auto_monitor_events = [
-                    e for e in events
-                    if e.get("event_type") == "auto_monitor"
-                    and container.id in e.get("container_id", "")
-                ]
+            if stream is None:
+                raise requests.exceptions.ConnectionError()
+            if stream.status_code != 200:
+                print(f"⚠ API returned status code: {stream.status_code}")
+            else:
+                auto_monitor_event = wait_for_event(stream, container.id[:12], "auto_monitor", timeout=10)
 
-                if auto_monitor_events:
+                if auto_monitor_event:
                     print("✓ Container was automatically added to monitoring!")
-                    event = auto_monitor_events[0]
+                    event = auto_monitor_event
                     print(f"  Event Type: {event['event_type']}")
                     print(f"  Container: {event['container_name']}")
                     print(f"  Status: {event['status']}")
                     print(f"  Message: {event['message']}")
                     print(f"  Timestamp: {event['timestamp']}")
                 else:
-                    print("⚠ No auto-monitor event found yet (may need more time)")
-            else:
-                print(f"⚠ API returned status code: {response.status_code}")
+                    print("⚠ No auto-monitor event received within 10 seconds")
         except requests.exceptions.ConnectionError:
             print("⚠ Could not connect to autoheal API at localhost:3131")
             print("  Make sure docker-autoheal service is running")
@@ -91,8 +127,8 @@ def test_auto_monitoring():
             print(f"⚠ Error checking events: {e}")
         print()
 
-        # Step 5: Verify container is in monitored list
-        print("Step 5: Checking configuration...")
+        # Step 4: Verify container is in monitored list
+        print("Step 4: Checking configuration...")
         try:
             response = requests.get("http://localhost:3131/api/config", timeout=5)
             if response.status_code == 200:
@@ -110,8 +146,8 @@ def test_auto_monitoring():
             print(f"⚠ Error checking config: {e}")
         print()
 
-        # Step 6: Show container details
-        print("Step 6: Container details...")
+        # Step 5: Show container details
+        print("Step 5: Container details...")
         container.reload()
         print(f"  Name: {container.name}")
         print(f"  Status: {container.status}")
@@ -123,8 +159,8 @@ def test_auto_monitoring():
             print(f"    {key}={value}")
         print()
 
-        # Step 7: Test without label
-        print("Step 7: Testing container WITHOUT autoheal label...")
+        # Step 6: Test without label
+        print("Step 6: Testing container WITHOUT autoheal label...")
         test_container_no_label = "autoheal-test-no-label"
         try:
             existing = client.containers.get(test_container_no_label)
@@ -143,22 +179,17 @@ def test_auto_monitoring():
         print(f"  This container should NOT be auto-monitored")
         print()
 
-        time.sleep(3)
-
         try:
-            response = requests.get("http://localhost:3131/api/events", timeout=5)
-            if response.status_code == 200:
-                events = response.json()
-                auto_monitor_events = [
-                    e for e in events
-                    if e.get("event_type") == "auto_monitor"
-                    and container_no_label.id in e.get("container_id", "")
-                ]
-
-                if not auto_monitor_events:
-                    print("✓ Correctly skipped container without autoheal=true label")
-                else:
-                    print("⚠ Container was unexpectedly auto-monitored")
+            if stream is None or stream.status_code != 200:
+                raise RuntimeError("event stream unavailable")
+
+            # Nothing should arrive for this container; wait a few seconds to be sure
+            unexpected_event = wait_for_event(stream, container_no_label.id[:12], "auto_monitor", timeout=3)
+
+            if unexpected_event is None:
+                print("✓ Correctly skipped container without autoheal=true label")
+            else:
+                print("⚠ Container was unexpectedly auto-monitored")
         except Exception as e:
             print(f"⚠ Error checking events: {e}")
         print()
@@ -195,6 +226,9 @@ def test_auto_monitoring():
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        if stream is not None:
+            stream.close()
 
     return True
 
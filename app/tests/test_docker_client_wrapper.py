@@ -0,0 +1,337 @@
+"""
+Unit tests for DockerClientWrapper container info caching and restarts.
+Verifies that get_container_info reuses inspect results within the TTL
+and inspects again once a container is restarted, invalidated or reported
+changed by the Docker events stream, that caches are pruned for removed
+containers, and that concurrent restarts are bounded.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from unittest.mock import patch, MagicMock
+import pytest
+
+from app.docker_client.docker_client_wrapper import DockerClientWrapper, parse_endpoint
+
+
+def make_container(container_id: str = "a" * 64, name: str = "web") -> MagicMock:
+    """Build a container double with the attrs get_container_info reads"""
+    container = MagicMock()
+    container.id = container_id
+    container.name = name
+    container.status = "running"
+    container.attrs = {
+        "Image": "sha256:abc",
+        "RestartCount": 0,
+        "Config": {"Image": "nginx:latest", "Labels": {}},
+        "State": {"Status": "running"},
+        "HostConfig": {"RestartPolicy": {}},
+        "NetworkSettings": {"Networks": {"bridge": {"IPAddress": "172.17.0.2"}}},
+    }
+    return container
+
+
+class TestContainerInfoCache:
+    """Test the get_container_info TTL cache"""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        """Create a wrapper without a real Docker daemon"""
+        with patch('app.docker_client.docker_client_wrapper.docker.DockerClient'):
+            self.client = DockerClientWrapper(info_ttl=60.0)
+            yield
+
+    def test_info_reused_within_ttl(self):
+        """Test that a second lookup inside the TTL does not inspect again"""
+        container = make_container()
+
+        first = self.client.get_container_info(container)
+        second = self.client.get_container_info(container)
+
+        assert container.reload.call_count == 1
+        assert first == second
+        assert first["name"] == "web"
+
+    def test_cached_info_not_mutated_by_callers(self):
+        """Test that callers annotating the returned dict don't change the cache"""
+        container = make_container()
+
+        info = self.client.get_container_info(container)
+        info["restart_count"] = 99
+
+        assert self.client.get_container_info(container)["restart_count"] == 0
+
+    def test_restart_count_read_from_top_level(self):
+        """Test that restart_count comes from the top-level inspect field"""
+        container = make_container()
+        container.attrs["RestartCount"] = 4
+
+        assert self.client.get_container_info(container)["restart_count"] == 4
+
+    def test_restart_invalidates_cache(self):
+        """Test that a successful restart forces the next lookup to inspect"""
+        container = make_container()
+
+        self.client.get_container_info(container)
+        assert self.client.restart_container(container)
+        self.client.get_container_info(container)
+
+        assert container.reload.call_count == 2
+
+    def test_skip_reload_uses_listed_attrs(self):
+        """Test that skip_reload builds info from current attrs and refreshes the cache"""
+        container = make_container()
+
+        info = self.client.get_container_info(container, skip_reload=True)
+        self.client.get_container_info(container)
+
+        container.reload.assert_not_called()
+        assert info["name"] == "web"
+
+    def test_invalidate_container(self):
+        """Test explicit invalidation, as done for Docker events"""
+        container = make_container()
+
+        self.client.get_container_info(container)
+        self.client.invalidate_container(container.id)
+        self.client.get_container_info(container)
+
+        assert container.reload.call_count == 2
+
+
+class TestEventDrivenState:
+    """Test the state map fed by the Docker events stream"""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        """Create a wrapper without a real Docker daemon"""
+        with patch('app.docker_client.docker_client_wrapper.docker.DockerClient'):
+            self.client = DockerClientWrapper(info_ttl=0.0)
+            yield
+
+    def test_tracked_container_cached_until_event(self):
+        """Test that info for an event-tracked container outlives the TTL"""
+        container = make_container()
+        self.client.apply_event({"id": container.id, "Action": "start"})
+
+        self.client.get_container_info(container)
+        self.client.get_container_info(container)
+        assert container.reload.call_count == 1
+
+        self.client.apply_event({"id": container.id, "Action": "die"})
+        self.client.get_container_info(container)
+        assert container.reload.call_count == 2
+
+    def test_untracked_container_uses_ttl(self):
+        """Test that containers never seen via events fall back to the TTL"""
+        container = make_container()
+
+        self.client.get_container_info(container)
+        self.client.get_container_info(container)
+
+        assert container.reload.call_count == 2
+
+    def test_health_status_event(self):
+        """Test that health_status actions are recorded"""
+        container_id = "b" * 64
+        self.client.apply_event({"id": container_id, "Action": "health_status: unhealthy"})
+
+        assert self.client.get_container_state(container_id)["health"] == "unhealthy"
+
+    def test_irrelevant_events_ignored(self):
+        """Test that exec events don't create state entries"""
+        container_id = "c" * 64
+        self.client.apply_event({"id": container_id, "Action": "exec_start: /bin/sh -c true"})
+
+        assert self.client.get_container_state(container_id) is None
+
+    def test_unmapped_event_invalidates_info(self):
+        """Test that a rename of a tracked container forces a fresh inspect"""
+        container = make_container()
+        self.client.apply_event({"id": container.id, "Action": "start"})
+        self.client.get_container_info(container)
+
+        self.client.apply_event({"id": container.id, "Action": "rename"})
+        self.client.get_container_info(container)
+
+        assert container.reload.call_count == 2
+
+    def test_network_event_invalidates_info(self):
+        """Test that network connect events invalidate the attached container"""
+        container = make_container()
+        self.client.apply_event({"id": container.id, "Action": "start"})
+        self.client.get_container_info(container)
+
+        self.client.apply_event({
+            "Type": "network", "Action": "connect", "id": "f" * 64,
+            "Actor": {"Attributes": {"container": container.id}}
+        })
+        self.client.get_container_info(container)
+
+        assert container.reload.call_count == 2
+
+    def test_tracked_info_bounded_by_event_max_age(self):
+        """Test that a silent events stream can't keep info cached forever"""
+        self.client.event_max_age = 0.0
+        container = make_container()
+        self.client.apply_event({"id": container.id, "Action": "start"})
+
+        self.client.get_container_info(container)
+        self.client.get_container_info(container)
+
+        assert container.reload.call_count == 2
+
+    def test_prune_caches(self):
+        """Test that containers missing from the list lose their cached entries"""
+        kept, gone = make_container("k" * 64), make_container("g" * 64)
+        for container in (kept, gone):
+            self.client.apply_event({"id": container.id, "Action": "start"})
+            self.client.get_container_info(container)
+
+        self.client.prune_caches([kept.id])
+
+        assert self.client.get_container_state(kept.id) is not None
+        assert self.client.get_container_state(gone.id) is None
+        assert gone.id not in self.client._info_cache
+
+    def test_prune_while_events_arrive(self):
+        """Test that pruning is safe while the events thread mutates the caches"""
+        stop = threading.Event()
+        errors = []
+        kept = [f"{i:064d}" for i in range(5000)]
+        for container_id in kept:
+            self.client.apply_event({"id": container_id, "Action": "start"})
+
+        def pump_events():
+            i = 0
+            while not stop.is_set():
+                # New IDs grow the state map while prune_caches walks it
+                self.client.apply_event({"id": f"n{i:063d}", "Action": "start"})
+                self.client.apply_event({"id": f"n{i:063d}", "Action": "destroy"})
+                i += 1
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        pump = threading.Thread(target=pump_events)
+        pump.start()
+        try:
+            for _ in range(200):
+                try:
+                    self.client.prune_caches(kept)
+                except RuntimeError as e:
+                    errors.append(e)
+        finally:
+            stop.set()
+            pump.join()
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+
+    def test_reset_event_state(self):
+        """Test that a stream reconnect forgets event-driven state"""
+        container_id = "d" * 64
+        self.client.apply_event({"id": container_id, "Action": "stop"})
+        self.client.reset_event_state()
+
+        assert self.client.get_container_state(container_id) is None
+
+
+class TestRestartConcurrency:
+    """Test bounded concurrent restarts"""
+
+    @pytest.mark.asyncio
+    async def test_restarts_bounded_by_semaphore(self):
+        """Test that no more than max_concurrent_restarts run at once"""
+        with patch('app.docker_client.docker_client_wrapper.docker.DockerClient'):
+            client = DockerClientWrapper(max_concurrent_restarts=2)
+
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_restart(timeout):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+
+        containers = [make_container(container_id=str(i) * 64, name=f"c{i}") for i in range(6)]
+        for container in containers:
+            container.restart.side_effect = slow_restart
+
+        results = await asyncio.gather(*(client.restart_container_async(c) for c in containers))
+
+        assert all(results)
+        assert state["peak"] == 2
+
+
+class TestContainerIp:
+    """Test IP address selection for HTTP/TCP health checks"""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        """Create a wrapper without a real Docker daemon"""
+        with patch('app.docker_client.docker_client_wrapper.docker.DockerClient'):
+            self.client = DockerClientWrapper()
+            yield
+
+    @pytest.mark.asyncio
+    async def test_top_level_ip_preferred(self):
+        """Test the default bridge fast path"""
+        container = make_container()
+        container.attrs["NetworkSettings"] = {
+            "IPAddress": "172.17.0.9", "Networks": {"app": {"IPAddress": "10.0.0.2"}}
+        }
+
+        assert await self.client.get_container_ip(container) == "172.17.0.9"
+        container.reload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bridge_network_preferred(self):
+        """Test that bridge wins over other attached networks regardless of order"""
+        container = make_container()
+        container.attrs["NetworkSettings"] = {"Networks": {
+            "app": {"IPAddress": "10.0.0.2"},
+            "bridge": {"IPAddress": "172.17.0.3"},
+        }}
+
+        assert await self.client.get_container_ip(container) == "172.17.0.3"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_inspect(self):
+        """Test that containers without inspect attributes are reloaded"""
+        container = make_container()
+        network_settings = container.attrs.pop("NetworkSettings")
+        container.reload.side_effect = lambda: container.attrs.update(NetworkSettings=network_settings)
+
+        assert await self.client.get_container_ip(container) == "172.17.0.2"
+        container.reload.assert_called_once()
+
+
+class TestParseEndpoint:
+    """Test HTTP health check endpoint parsing"""
+
+    def test_localhost_replaced_by_container_ip(self):
+        """Test that a localhost endpoint targets the container IP"""
+        parsed = parse_endpoint("http://localhost:3131/health?full=1")
+
+        assert parsed.url_for("172.17.0.2") == "http://172.17.0.2:3131/health?full=1"
+
+    def test_path_containing_localhost_untouched(self):
+        """Test that only the host is substituted, not matching text in the path"""
+        parsed = parse_endpoint("http://127.0.0.1/check/localhost")
+
+        assert parsed.url_for("172.17.0.2") == "http://172.17.0.2/check/localhost"
+
+    def test_external_host_kept(self):
+        """Test that non-local hosts are probed as configured"""
+        parsed = parse_endpoint("https://status.example.com:8443/ping")
+
+        assert parsed.url_for("172.17.0.2") == "https://status.example.com:8443/ping"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
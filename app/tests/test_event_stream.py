@@ -0,0 +1,64 @@
+"""
+Unit tests for the /api/events/stream feed.
+Verifies the event listener and serving loop follow the app's lifespan.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+import pytest
+
+from app.api import api
+from app.config.config_manager import config_manager, AutoHealEvent
+
+
+def make_event(container_id: str = "abc123def456") -> AutoHealEvent:
+    """Build a restart event for a container"""
+    return AutoHealEvent(
+        timestamp=datetime.now(timezone.utc),
+        container_id=container_id,
+        container_name="web",
+        event_type="restart",
+        restart_count=1,
+        status="success",
+        message="test"
+    )
+
+
+class TestEventStreamLifespan:
+    """Test listener registration and loop capture in the app lifespan"""
+
+    @pytest.fixture(autouse=True)
+    def clean_events(self):
+        """Start and finish with an empty event log"""
+        config_manager.clear_events()
+        yield
+        config_manager.clear_events()
+
+    @pytest.mark.asyncio
+    async def test_listener_registered_only_during_lifespan(self):
+        """The listener is added on startup and removed on shutdown"""
+        assert api._broadcast_event not in config_manager._event_listeners
+        assert api._event_loop is None
+
+        async with api.lifespan(api.app):
+            assert api._broadcast_event in config_manager._event_listeners
+            assert api._event_loop is asyncio.get_running_loop()
+
+        assert api._broadcast_event not in config_manager._event_listeners
+        assert api._event_loop is None
+
+    @pytest.mark.asyncio
+    async def test_subscriber_receives_event_before_any_stream_request(self):
+        """Events reach subscribers without a prior /api/events/stream call setting the loop"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=api.EVENT_STREAM_QUEUE_SIZE)
+
+        async with api.lifespan(api.app):
+            api._event_subscribers.add(queue)
+            try:
+                config_manager.add_event(make_event())
+                data = await asyncio.wait_for(queue.get(), timeout=1)
+            finally:
+                api._event_subscribers.discard(queue)
+
+        assert data["container_id"] == "abc123def456"
+        assert data["event_type"] == "restart"
@@ -0,0 +1,70 @@
+"""
+Unit tests for filtering the event log by container and event type.
+Verifies the per-container index stays in step with the bounded event log.
+"""
+
+from datetime import datetime, timezone
+import pytest
+
+from app.config.config_manager import config_manager, AutoHealEvent
+
+
+def make_event(container_id: str, event_type: str = "restart") -> AutoHealEvent:
+    """Build an event for a container"""
+    return AutoHealEvent(
+        timestamp=datetime.now(timezone.utc),
+        container_id=container_id,
+        container_name=f"name-{container_id[:4]}",
+        event_type=event_type,
+        restart_count=0,
+        status="success",
+        message="test"
+    )
+
+
+class TestEventFilter:
+    """Test get_events container_id / event_type filters"""
+
+    @pytest.fixture(autouse=True)
+    def clean_events(self):
+        """Start and finish with an empty event log"""
+        config_manager.clear_events()
+        yield
+        config_manager.clear_events()
+
+    def test_filter_by_short_and_full_id(self):
+        """Events are found by short or full container ID"""
+        full_a = "a" * 64
+        config_manager.add_event(make_event(full_a))
+        config_manager.add_event(make_event("b" * 64))
+        config_manager.add_event(make_event(full_a, "auto_monitor"))
+
+        assert len(config_manager.get_events(container_id=full_a[:12])) == 2
+        assert len(config_manager.get_events(container_id=full_a)) == 2
+
+        hits = config_manager.get_events(container_id=full_a[:12], event_type="auto_monitor")
+        assert [e.event_type for e in hits] == ["auto_monitor"]
+
+    def test_filter_by_id_prefix_shorter_than_index_key(self):
+        """Prefixes under 12 characters fall back to scanning the log"""
+        config_manager.add_event(make_event("ab" + "1" * 62))
+        config_manager.add_event(make_event("ab" + "2" * 62))
+        config_manager.add_event(make_event("cd" + "1" * 62))
+
+        assert len(config_manager.get_events(container_id="ab")) == 2
+        assert len(config_manager.get_events(container_id="ab1", event_type="restart")) == 1
+
+    def test_index_follows_log_trimming(self):
+        """Events dropped by the size limit disappear from the index too"""
+        max_entries = config_manager.get_config().ui.max_log_entries
+        old_id = "c" * 64
+        config_manager.add_event(make_event(old_id))
+        for i in range(max_entries):
+            config_manager.add_event(make_event(f"{i:064d}"))
+
+        assert config_manager.get_events(container_id=old_id) == []
+        assert len(config_manager.get_events()) == max_entries
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -15,7 +15,8 @@ from app.config.init_defaults import (
     get_default_config,
     get_default_events,
     get_default_quarantine,
-    get_default_maintenance
+    get_default_maintenance,
+    init_data_file
 )
 
 
@@ -95,6 +96,24 @@ class TestInitDefaults:
         assert config["observability"]["metrics_port"] == 9090
         assert config["observability"]["log_level"] == "INFO"
 
+    def test_default_config_returns_independent_copies(self):
+        """Test that mutating a returned config does not leak into later calls"""
+        config = get_default_config()
+        config["monitor"]["interval_seconds"] = 99
+        config["containers"]["selected"].append("web")
+
+        fresh = get_default_config()
+        assert fresh["monitor"]["interval_seconds"] == 30
+        assert fresh["containers"]["selected"] == []
+
+    def test_init_data_file_creates_missing_directory(self):
+        """Test that init_data_file creates the parent directory when needed"""
+        target = self.temp_dir / "nested" / "extra.json"
+
+        assert init_data_file(target, [], "extra file")
+        assert json.loads(target.read_text()) == []
+        assert not init_data_file(target, [], "extra file")
+
     def test_default_events_is_empty_list(self):
         """Test that default events is an empty list"""
         events = get_default_events()
@@ -1,14 +1,17 @@
 """
 Unit tests for Prometheus metrics server startup logic.
 Verifies that start_http_server is called when prometheus_enabled is True,
-regardless of notification settings.
+regardless of notification settings, and that per-container metric labels stay bounded.
 """
 
 import asyncio
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock, AsyncMock
 import pytest
+from prometheus_client import CollectorRegistry, Counter
 
-from app.main import AutoHealService
+from app.main import AutoHealService, BoundedLabels, record_event_metrics
+from app.config.config_manager import AutoHealEvent
 
 
 class TestPrometheusStart:
@@ -116,5 +119,67 @@ class TestPrometheusStart:
             self.mock_http_server.assert_called_once_with(8080)
 
 
+class TestBoundedLabels:
+    """Test that labelled metrics keep a bounded number of container names"""
+
+    def _make_counter(self):
+        return Counter('test_restarts_total', 'Test restarts', ['container_name'],
+                       registry=CollectorRegistry())
+
+    def _label_values(self, counter):
+        return {sample.labels["container_name"]
+                for metric in counter.collect()
+                for sample in metric.samples if sample.name.endswith("_total")}
+
+    def test_least_recently_used_name_evicted(self):
+        """Oldest untouched container name should be removed once the limit is hit"""
+        counter = self._make_counter()
+        bounded = BoundedLabels(counter, max_labels=2)
+
+        bounded.labels("a").inc()
+        bounded.labels("b").inc()
+        bounded.labels("a").inc()  # "b" is now least recently used
+        bounded.labels("c").inc()
+
+        assert self._label_values(counter) == {"a", "c"}
+
+    def test_existing_name_keeps_count(self):
+        """Reusing a tracked name should keep incrementing the same child"""
+        counter = self._make_counter()
+        bounded = BoundedLabels(counter, max_labels=2)
+
+        bounded.labels("a").inc()
+        bounded.labels("a").inc()
+
+        assert counter.labels(container_name="a")._value.get() == 2
+
+
+class TestEventMetrics:
+    """Test restart counting from auto-heal events"""
+
+    def _event(self, status: str, event_type: str = "restart") -> AutoHealEvent:
+        return AutoHealEvent(
+            timestamp=datetime.now(timezone.utc),
+            container_id="a" * 64,
+            container_name="web (myproject_web)",
+            event_type=event_type,
+            restart_count=1,
+            status=status,
+            message="test",
+            docker_name="web"
+        )
+
+    def test_only_successful_restarts_counted_by_plain_name(self):
+        """Failed restarts and other events are ignored, the label is the container name"""
+        bounded = MagicMock()
+        with patch('app.main.container_restarts_by_name', bounded):
+            record_event_metrics(self._event("success"))
+            record_event_metrics(self._event("failure"))
+            record_event_metrics(self._event("quarantined", event_type="quarantine"))
+
+        bounded.labels.assert_called_once_with("web")
+        bounded.labels.return_value.inc.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
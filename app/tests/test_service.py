@@ -8,22 +8,40 @@ This file is now located at tests/test_service.py
 
 import requests
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:3131"
 
+# Per-thread state: each probe worker gets its own session and output buffer
+_local = threading.local()
+
+def get_session():
+    """Session for the current thread, requests.Session is not shared across probe threads"""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+def emit(line):
+    """Print a line, or collect it when running inside a probe worker"""
+    lines = getattr(_local, "lines", None)
+    if lines is None:
+        print(line)
+    else:
+        lines.append(line)
+
 def print_status(emoji, message):
-    print(f"{emoji} {message}")
+    emit(f"{emoji} {message}")
 
 def test_health():
     """Test health endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = get_session().get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print_status("✅", "Health endpoint OK")
-            print(f"   Docker connected: {data.get('docker_connected')}")
-            print(f"   Monitoring active: {data.get('monitoring_active')}")
+            emit(f"   Docker connected: {data.get('docker_connected')}")
+            emit(f"   Monitoring active: {data.get('monitoring_active')}")
             return True
         else:
             print_status("❌", f"Health endpoint returned {response.status_code}")
@@ -35,12 +53,12 @@ def test_health():
 def test_api():
     """Test API status endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/api/status", timeout=5)
+        response = get_session().get(f"{BASE_URL}/api/status", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print_status("✅", "API endpoint OK")
-            print(f"   Total containers: {data.get('total_containers')}")
-            print(f"   Monitored: {data.get('monitored_containers')}")
+            emit(f"   Total containers: {data.get('total_containers')}")
+            emit(f"   Monitored: {data.get('monitored_containers')}")
             return True
         else:
             print_status("❌", f"API returned {response.status_code}")
@@ -52,7 +70,7 @@ def test_api():
 def test_ui():
     """Test UI is accessible"""
     try:
-        response = requests.get(BASE_URL, timeout=5)
+        response = get_session().get(BASE_URL, timeout=5)
         if response.status_code == 200 and 'text/html' in response.headers.get('content-type', ''):
             if 'root' in response.text:  # React mounts to #root
                 print_status("✅", "React UI is accessible")
@@ -70,7 +88,7 @@ def test_ui():
 def test_metrics():
     """Test Prometheus metrics endpoint"""
     try:
-        response = requests.get("http://localhost:9090/metrics", timeout=5)
+        response = get_session().get("http://localhost:9090/metrics", timeout=5)
         if response.status_code == 200:
             print_status("✅", "Metrics endpoint OK")
             return True
@@ -95,11 +113,23 @@ def main():
         ("Metrics", test_metrics),
     ]
 
+    def run_test(test):
+        """Run one probe, returning its result and the lines it printed"""
+        name, test_func = test
+        _local.lines = [f"\n[Testing: {name}]"]
+        try:
+            return test_func(), _local.lines
+        finally:
+            _local.lines = None
+
+    # Probes are independent, so run them concurrently and print each one's output in order
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        outcomes = list(executor.map(run_test, tests))
+
     results = []
-    for name, test_func in tests:
-        print(f"\n[Testing: {name}]")
-        results.append(test_func())
-        time.sleep(0.5)
+    for result, lines in outcomes:
+        print("\n".join(lines))
+        results.append(result)
 
     print("\n" + "="*60)
     print("  Test Results")
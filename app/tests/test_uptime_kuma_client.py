@@ -0,0 +1,169 @@
+"""
+Unit tests for the Uptime-Kuma /metrics client
+Tests parsing of Prometheus monitor_status lines and conditional-GET snapshot caching
+"""
+
+import shutil
+import tempfile
+import zlib
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import web
+
+import pytest
+
+from app.uptime_kuma.uptime_kuma_client import UptimeKumaClient
+
+
+METRICS = (
+    b'# HELP monitor_status Monitor Status (1 = UP, 0= DOWN, 2= PENDING, 3= MAINTENANCE)\n'
+    b'# TYPE monitor_status gauge\n'
+    b'monitor_status{monitor_name="web",monitor_url="https://example.com",monitor_hostname="",monitor_port=""} 1\n'
+    b'monitor_status{monitor_name="db",monitor_url="",monitor_hostname="db",monitor_port="5432"} 0\n'
+    b'app_version{version="1.23.0",major="1",minor="23",patch="0"} 1\n'
+)
+
+
+@asynccontextmanager
+async def metrics_server(etag: Optional[str]):
+    """Serve METRICS on a local port, answering 304 when If-None-Match matches etag"""
+    requests = []
+
+    async def handle(request):
+        requests.append(request)
+        if etag and request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304)
+        headers = {'ETag': etag} if etag else {}
+        return web.Response(body=METRICS, content_type='text/plain', headers=headers)
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f"http://127.0.0.1:{port}", requests
+    finally:
+        await runner.cleanup()
+
+
+class TestUptimeKumaClient:
+    """Test monitor parsing from /metrics output"""
+
+    def setup_method(self):
+        self.client = UptimeKumaClient("http://kuma:3001/", "secret")
+
+    def test_parse_monitors_from_metrics(self):
+        """All monitor_status lines are parsed, other metrics are ignored"""
+        monitors = self.client._parse_monitors_from_metrics(METRICS)
+
+        assert [(m['friendly_name'], m['status']) for m in monitors] == [("web", 1), ("db", 0)]
+
+    def test_parse_skips_malformed_series(self):
+        """Series without a numeric value are skipped, braces inside labels are tolerated"""
+        metrics = (
+            b'monitor_status{monitor_name="api",monitor_url="https://x/{id}"} 2\n'
+            b'monitor_status{monitor_name="broken"} NaN\n'
+            b'monitor_status{monitor_name="float"} 1.5\n'
+            b'monitor_status{monitor_name="stamped"} 0 1700000000000\r\n'
+            b'monitor_status{monitor_name="last",monitor_url=""} 3'
+        )
+        monitors = self.client._parse_monitors_from_metrics(metrics)
+
+        assert [(m['friendly_name'], m['status']) for m in monitors] == [("api", 2), ("stamped", 0), ("last", 3)]
+
+    def test_parse_empty_payload(self):
+        """Payloads without monitor_status series yield no monitors"""
+        assert self.client._parse_monitors_from_metrics(b'') == []
+        assert self.client._parse_monitors_from_metrics(b'# TYPE monitor_status gauge\n') == []
+
+    def test_monitor_ids_are_stable(self):
+        """Monitor IDs are derived deterministically from the monitor name"""
+        monitors = self.client._parse_monitors_from_metrics(METRICS)
+
+        assert monitors[0]['id'] == zlib.crc32(b"web")
+        assert monitors[1]['id'] == zlib.crc32(b"db")
+
+    @pytest.mark.asyncio
+    async def test_status_lookups_share_cached_snapshot(self):
+        """Lookups within the TTL reuse one /metrics fetch"""
+        monitors = self.client._parse_monitors_from_metrics(METRICS)
+        self.client._fetch_monitors = AsyncMock(return_value=monitors)
+
+        assert await self.client.get_monitor_status_by_name("web") == 1
+        assert await self.client.get_monitor_status_by_name("db") == 0
+        assert await self.client.get_monitor_status_by_name("missing") is None
+        assert len(await self.client.get_all_monitors()) == 2
+        assert self.client.monitor_statuses == {"web": 1, "db": 0}
+
+        self.client._fetch_monitors.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached(self):
+        """A failed fetch returns no data and is retried on the next lookup"""
+        self.client._fetch_monitors = AsyncMock(return_value=None)
+
+        assert await self.client.get_monitor_status_by_name("web") is None
+        assert await self.client.get_all_monitors() == []
+        assert self.client._fetch_monitors.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_not_modified_reuses_parsed_monitors(self):
+        """A 304 answer reuses the cached list without parsing the body again"""
+        async with metrics_server(etag='"v1"') as (url, requests):
+            client = UptimeKumaClient(url, "secret", cache_ttl=0)
+            try:
+                first = await client.get_all_monitors()
+                client._parse_monitors_from_metrics = MagicMock()
+                second = await client.get_all_monitors()
+            finally:
+                await client.close()
+
+        assert first == second
+        client._parse_monitors_from_metrics.assert_not_called()
+        assert [r.headers.get('If-None-Match') for r in requests] == [None, '"v1"']
+
+    @pytest.mark.asyncio
+    async def test_snapshot_persists_across_clients(self):
+        """A snapshot with validators is written to disk and reloaded (expired) by a new client"""
+        cache_dir = Path(tempfile.mkdtemp())
+        try:
+            async with metrics_server(etag='"v1"') as (url, requests):
+                client = UptimeKumaClient(url, "secret", cache_dir=cache_dir)
+                async with client:
+                    await client.get_all_monitors()
+                assert (cache_dir / "monitors.cache.json").exists()
+
+                restarted = UptimeKumaClient(url, "secret", cache_dir=cache_dir)
+                assert restarted._cache['by_name'] == {"web": 1, "db": 0}
+
+                # Loaded snapshot is revalidated before use; the server answers 304
+                async with restarted:
+                    assert await restarted.get_monitor_status_by_name("db") == 0
+                assert requests[-1].headers.get('If-None-Match') == '"v1"'
+
+            other_server = UptimeKumaClient("http://other:3001", "secret", cache_dir=cache_dir)
+            assert other_server._cache is None
+        finally:
+            shutil.rmtree(cache_dir)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_without_validators_not_persisted(self):
+        """Bodies without ETag/Last-Modified are never written to disk"""
+        cache_dir = Path(tempfile.mkdtemp())
+        try:
+            async with metrics_server(etag=None) as (url, _):
+                async with UptimeKumaClient(url, "secret", cache_dir=cache_dir) as client:
+                    assert len(await client.get_all_monitors()) == 2
+            assert not (cache_dir / "monitors.cache.json").exists()
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
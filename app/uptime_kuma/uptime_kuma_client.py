@@ -3,18 +3,49 @@ Uptime-Kuma API client for fetching monitor statuses
 Uses the /metrics endpoint with Basic Authentication
 """
 import aiohttp
+import asyncio
 import logging
-import re
-from typing import List, Dict, Optional
+import time
+import zlib
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Set
 from aiohttp import BasicAuth
 
+from app.utils import json_utils
+
 logger = logging.getLogger(__name__)
 
+# Format: monitor_status{monitor_name="My Monitor",monitor_url="https://example.com",monitor_hostname="",monitor_port=""} 1
+_STATUS_PREFIX = b'monitor_status{monitor_name="'
+
+CACHE_FILE_NAME = "monitors.cache.json"
+
+# Bodies larger than this are parsed in a worker thread to keep the event loop responsive
+PARSE_OFFLOAD_BYTES = 64 * 1024
+
+
+def _parse_int(buf: bytes, start: int, end: int) -> Optional[int]:
+    """Parse the unsigned integer sample value in buf[start:end] without slicing"""
+    i = start
+    while i < end and buf[i] in b' \t':
+        i += 1
+
+    value = None
+    while i < end and 0x30 <= buf[i] <= 0x39:
+        value = (value or 0) * 10 + buf[i] - 0x30
+        i += 1
+
+    # The value must end at whitespace (optional timestamp) or the end of the line
+    if value is None or (i < end and buf[i] not in b' \t\r'):
+        return None
+    return value
+
 
 class UptimeKumaClient:
     """Client for interacting with Uptime-Kuma API using /metrics endpoint"""
 
-    def __init__(self, server_url: str, password: str, username: str = ""):
+    def __init__(self, server_url: str, password: str, username: str = "", cache_ttl: float = 5.0,
+                 cache_dir: Optional[Path] = None):
         self.server_url = server_url.rstrip('/')
         self.password = password
         self.username = username
@@ -23,77 +54,254 @@ class UptimeKumaClient:
         # For user auth: username=username, password=password
         self.auth = BasicAuth(username if username else '', password)
         self.session: Optional[aiohttp.ClientSession] = None
+        # Parsed /metrics snapshot shared by all lookups for cache_ttl seconds
+        self.cache_ttl = cache_ttl
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_time = float('-inf')
+        self._cache_lock = asyncio.Lock()
+        # Validators for conditional GET, so an unchanged /metrics body is not re-parsed
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        # Optional on-disk copy of the last snapshot, survives restarts
+        self._server_key = f"{zlib.crc32(self.server_url.encode('utf-8')):08x}"
+        self._cache_file = cache_dir / CACHE_FILE_NAME if cache_dir else None
+        self._load_persisted_cache()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            # Prometheus text compresses roughly 10x, aiohttp decompresses transparently
+            self.session = aiohttp.ClientSession(headers={'Accept-Encoding': 'gzip, deflate'})
+        return self.session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def __aenter__(self) -> "UptimeKumaClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def monitor_statuses(self) -> Dict[str, int]:
+        """Status by friendly name from the last fetched snapshot, without refreshing it"""
+        return self._cache['by_name'] if self._cache else {}
 
     async def connect(self) -> bool:
         """Test connection to Uptime-Kuma server"""
+        url = f"{self.server_url}/metrics"
+        timeout = aiohttp.ClientTimeout(total=10)
         try:
-            logger.debug(f"Attempting to connect to {self.server_url}/metrics")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.server_url}/metrics",
-                    auth=self.auth,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    logger.debug(f"Response status: {response.status}")
-                    if response.status == 200:
-                        text = await response.text()
-                        # Check if we got valid metrics data
-                        has_metrics = 'monitor_status' in text or 'app_version' in text
-                        logger.debug(f"Has metrics data: {has_metrics}")
-                        return has_metrics
+            logger.debug(f"Attempting to connect to {url}")
+            session = self._get_session()
+            # HEAD confirms reachability and auth without downloading the metrics body
+            async with session.head(url, auth=self.auth, timeout=timeout) as response:
+                logger.debug(f"HEAD response status: {response.status}")
+                if response.status == 200 and response.content_type == 'text/plain':
+                    return True
+                if response.status not in (200, 405, 501):
                     logger.warning(f"Unexpected response status: {response.status}")
                     return False
+
+            # HEAD not supported or inconclusive, read the body only until a marker shows up
+            async with session.get(url, auth=self.auth, timeout=timeout) as response:
+                logger.debug(f"Response status: {response.status}")
+                if response.status == 200:
+                    has_metrics = await self._body_has_metrics(response)
+                    logger.debug(f"Has metrics data: {has_metrics}")
+                    return has_metrics
+                logger.warning(f"Unexpected response status: {response.status}")
+                return False
         except Exception as e:
             logger.warning(f"Failed to connect to Uptime-Kuma: {e}")
             return False
 
+    @staticmethod
+    async def _body_has_metrics(response: aiohttp.ClientResponse) -> bool:
+        """Check a streamed /metrics body for metrics markers, stopping at the first hit"""
+        # app_version is present even when no monitors are configured
+        markers = (b'monitor_status', b'app_version')
+        overlap = max(len(m) for m in markers) - 1
+        tail = b''
+        async for chunk in response.content.iter_chunked(4096):
+            window = tail + chunk
+            if any(m in window for m in markers):
+                return True
+            tail = window[-overlap:]
+        return False
+
     async def get_all_monitors(self) -> List[Dict]:
         """Fetch all monitors from /metrics endpoint"""
+        data = await self._get_cached_parsed()
+        return list(data['monitors']) if data else []
+
+    async def _get_cached_parsed(self) -> Optional[Dict[str, Any]]:
+        """Return the parsed monitor snapshot, refetching it once the TTL has expired"""
+        async with self._cache_lock:
+            if self._cache is not None and time.monotonic() - self._cache_time < self.cache_ttl:
+                return self._cache
+
+            monitors = await self._fetch_monitors()
+            if monitors is None:
+                return None
+
+            # A 304 hands back the cached list itself, nothing to rebuild or persist
+            if self._cache is None or monitors is not self._cache['monitors']:
+                self._set_cache(monitors)
+                # Without validators a persisted snapshot could never be revalidated with a 304
+                if self._cache_file and (self._etag or self._last_modified):
+                    await asyncio.to_thread(self._persist_cache)
+            self._cache_time = time.monotonic()
+            return self._cache
+
+    def _set_cache(self, monitors: List[Dict]) -> None:
+        """Replace the parsed snapshot with a new monitor list"""
+        self._cache = {
+            'monitors': monitors,
+            'by_name': {m['friendly_name']: m['status'] for m in monitors}
+        }
+
+    def _load_persisted_cache(self) -> None:
+        """
+        Load the last persisted snapshot for this server, if any
+
+        The snapshot is loaded as already expired: monitor statuses drive
+        restarts, so it is always revalidated with a conditional GET before
+        use. An unchanged server answers 304 and the body is not re-parsed.
+        Snapshots are only written when the server sent ETag/Last-Modified.
+        """
+        if not self._cache_file:
+            return
+
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.server_url}/metrics",
-                    auth=self.auth,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch metrics: HTTP {response.status}")
-                        return []
-
-                    text = await response.text()
-                    monitors = self._parse_monitors_from_metrics(text)
-                    logger.debug(f"Parsed {len(monitors)} monitors from metrics")
-                    return monitors
+            raw = self._cache_file.read_bytes()
+            data = json_utils.loads(raw)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable Uptime-Kuma cache {self._cache_file}: {e}")
+            return
+
+        if data.get('server') != self._server_key:
+            return
+
+        self._set_cache(data.get('monitors', []))
+        self._etag = data.get('etag')
+        self._last_modified = data.get('last_modified')
+        logger.debug(f"Loaded {len(self._cache['monitors'])} cached Uptime-Kuma monitors from {self._cache_file}")
+
+    def _persist_cache(self) -> None:
+        """Write the current snapshot and its validators to disk (blocking, run in a thread)"""
+        if not self._cache_file or self._cache is None:
+            return
+
+        data = {
+            'server': self._server_key,
+            'etag': self._etag,
+            'last_modified': self._last_modified,
+            'monitors': self._cache['monitors']
+        }
+        try:
+            payload = json_utils.dumps(data)
+            self._cache_file.write_bytes(payload)
+        except Exception as e:
+            logger.debug(f"Failed to persist Uptime-Kuma cache to {self._cache_file}: {e}")
+
+    async def _fetch_monitors(self) -> Optional[List[Dict]]:
+        """Fetch and parse all monitors from /metrics, returns None on failure"""
+        headers = {}
+        if self._cache is not None:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+
+        try:
+            session = self._get_session()
+            async with session.get(
+                f"{self.server_url}/metrics",
+                auth=self.auth,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 304 and self._cache is not None:
+                    logger.debug("Metrics not modified, reusing cached monitors")
+                    return self._cache['monitors']
+
+                if response.status != 200:
+                    logger.error(f"Failed to fetch metrics: HTTP {response.status}")
+                    return None
+
+                logger.debug(f"Metrics Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+                data = await response.read()
+                if len(data) > PARSE_OFFLOAD_BYTES:
+                    monitors = await asyncio.to_thread(self._parse_monitors_from_metrics, data)
+                else:
+                    monitors = self._parse_monitors_from_metrics(data)
+                logger.debug(f"Parsed {len(monitors)} monitors from metrics")
+
+                self._etag = response.headers.get('ETag')
+                self._last_modified = response.headers.get('Last-Modified')
+                return monitors
         except Exception as e:
             logger.error(f"Failed to fetch monitors: {e}")
-            return []
+            return None
 
-    def _parse_monitors_from_metrics(self, metrics_text: str) -> List[Dict]:
+    @staticmethod
+    def _build_monitor(monitor_name: str, status: int) -> Dict:
+        """Build a monitor dict from a parsed monitor_status line"""
+        # Generate a stable ID based on the name (since metrics don't provide IDs)
+        # crc32 is deterministic across restarts, unlike the salted built-in hash()
+        monitor_id = zlib.crc32(monitor_name.encode('utf-8'))
+
+        return {
+            'id': monitor_id,
+            'friendly_name': monitor_name,
+            'status': status  # 0=down, 1=up, 2=pending, 3=maintenance
+        }
+
+    def _parse_monitors_from_metrics(self, data: bytes) -> List[Dict]:
         """Parse monitor data from Prometheus metrics format"""
-        monitors = {}
+        # Scan the raw bytes for each monitor_status series, no decode or regex needed
+        pos = data.find(_STATUS_PREFIX)
+        if pos == -1:
+            # No monitors configured yet, or not a metrics body at all
+            return []
 
-        # Parse monitor_status lines
-        # Format: monitor_status{monitor_name="My Monitor",monitor_url="https://example.com",monitor_hostname="",monitor_port=""} 1
-        status_pattern = r'monitor_status\{monitor_name="([^"]+)"[^}]*\}\s+(\d+)'
+        monitors: List[Dict] = []
+        seen: Set[str] = set()
+        prefix_len = len(_STATUS_PREFIX)
 
-        for match in re.finditer(status_pattern, metrics_text):
-            monitor_name = match.group(1)
-            status = int(match.group(2))
+        while pos != -1:
+            name_start = pos + prefix_len
+            name_end = data.find(b'"', name_start)
+            if name_end == -1:
+                break
 
-            # Generate a simple ID based on the name (since metrics don't provide IDs)
-            monitor_id = abs(hash(monitor_name)) % (10 ** 8)
+            line_end = data.find(b'\n', name_end)
+            if line_end == -1:
+                line_end = len(data)
 
-            monitors[monitor_name] = {
-                'id': monitor_id,
-                'friendly_name': monitor_name,
-                'status': status  # 0=down, 1=up, 2=pending, 3=maintenance
-            }
+            # Last brace on the line closes the label set (label values may contain braces)
+            brace = data.rfind(b'}', name_end, line_end)
+            status = _parse_int(data, brace + 1, line_end) if brace != -1 else None
+            if status is not None and name_end > name_start:
+                monitor_name = data[name_start:name_end].decode('utf-8', errors='replace')
+                if monitor_name not in seen:
+                    seen.add(monitor_name)
+                    monitors.append(self._build_monitor(monitor_name, status))
 
-        return list(monitors.values())
+            pos = data.find(_STATUS_PREFIX, line_end)
+
+        return monitors
 
     async def get_monitor_status(self, monitor_id: int) -> Optional[int]:
         """Get status of a specific monitor by ID"""
-        # Since we use hashed IDs, we need to fetch all monitors and find the matching one
+        # Since we use name-derived IDs, we need to fetch all monitors and find the matching one
         monitors = await self.get_all_monitors()
         for monitor in monitors:
             if monitor['id'] == monitor_id:
@@ -102,25 +310,7 @@ class UptimeKumaClient:
 
     async def get_monitor_status_by_name(self, monitor_name: str) -> Optional[int]:
         """Get status of a specific monitor by friendly name"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.server_url}/metrics",
-                    auth=self.auth,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status != 200:
-                        return None
-
-                    text = await response.text()
-                    # Look for this specific monitor's status
-                    pattern = rf'monitor_status\{{monitor_name="{re.escape(monitor_name)}"[^}}]*\}}\s+(\d+)'
-                    match = re.search(pattern, text)
-
-                    if match:
-                        return int(match.group(1))
-                    return None
-        except Exception as e:
-            logger.error(f"Failed to get monitor status for '{monitor_name}': {e}")
+        data = await self._get_cached_parsed()
+        if not data:
             return None
-
+        return data['by_name'].get(monitor_name)
@@ -1,62 +1,109 @@
 """Test Uptime Kuma API connectivity"""
 import asyncio
+import io
 import sys
-sys.path.insert(0, '.')
 
 from app.uptime_kuma.uptime_kuma_client import UptimeKumaClient
 
+# Uptime Kuma monitor status codes, indexed by status value
+_STATUS = ("DOWN", "UP", "PENDING", "MAINTENANCE")
+
+
+def status_name(status) -> str:
+    """Map a monitor status code to its name"""
+    return _STATUS[status] if isinstance(status, int) and 0 <= status < len(_STATUS) else "UNKNOWN"
+
+
+# Report lines are collected here and written out once per section
+_out = io.StringIO()
+
+
+def out(line: str = "") -> None:
+    """Append a line to the buffered report"""
+    _out.write(line)
+    _out.write("\n")
+
+
+def flush() -> None:
+    """Write the buffered section to stdout in one call"""
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+    _out.seek(0)
+    _out.truncate()
+
 
 async def main():
     server_url = "http://localhost:3001"
     api_key = "Admin@231" #"uk3_-Vo0N_-BFSE4rRfhPGY9qF7Nd9bUSIhDbmRkZ15Z"
     username = "admin"
 
-    print("=" * 70)
-    print("UPTIME KUMA API TEST")
-    print("=" * 70)
-    print(f"Server: {server_url}")
-    print(f"API Key: {api_key[:20]}...")
-    print(f"Username: '{username}' (empty for API key auth)")
-    print()
-
-    client = UptimeKumaClient(server_url, api_key, username)
-
-    # Test 1: Connection
-    print("TEST 1: Connection")
-    print("-" * 70)
-    connected = await client.connect()
-    if connected:
-        print("✅ Connection successful!")
-    else:
-        print("❌ Connection failed!")
-        return
-    print()
-
-    # Test 2: Get monitors
-    print("TEST 2: Get All Monitors")
-    print("-" * 70)
-    monitors = await client.get_all_monitors()
-    print(f"Found {len(monitors)} monitors:")
-    for m in monitors:
-        status = {0: "DOWN", 1: "UP", 2: "PENDING", 3: "MAINTENANCE"}.get(m['status'], "UNKNOWN")
-        print(f"  - {m['friendly_name']}: {status}")
-    print()
-
-    # Test 3: Get status by name
-    if monitors:
-        print("TEST 3: Get Status by Name")
-        print("-" * 70)
-        test_monitor = monitors[0]['friendly_name']
-        status = await client.get_monitor_status_by_name(test_monitor)
-        status_text = {0: "DOWN", 1: "UP", 2: "PENDING", 3: "MAINTENANCE"}.get(status, "UNKNOWN")
-        print(f"Monitor '{test_monitor}': {status_text}")
-        print()
-
-    print("=" * 70)
-    print("✅ All tests passed!")
-    print("=" * 70)
+    rule = "=" * 70
+    out(
+        f"{rule}\nUPTIME KUMA API TEST\n{rule}\n"
+        f"Server: {server_url}\n"
+        f"API Key: {api_key[:20]}...\n"
+        f"Username: '{username}' (empty for API key auth)\n"
+    )
+
+    async with UptimeKumaClient(server_url, api_key, username) as client:
+        # The monitor fetch for test 2 runs while the connection check is in flight
+        async with asyncio.TaskGroup() as tg:
+            connect_task = tg.create_task(client.connect())
+            monitors_task = tg.create_task(client.get_all_monitors())
+
+        # Test 1: Connection
+        out("TEST 1: Connection")
+        out("-" * 70)
+        connected = connect_task.result()
+        if connected:
+            out("✅ Connection successful!")
+        else:
+            out("❌ Connection failed!")
+            flush()
+            return
+        out()
+        flush()
+
+        # Test 2: Get monitors
+        out("TEST 2: Get All Monitors")
+        out("-" * 70)
+        monitors = monitors_task.result()
+        out(f"Found {len(monitors)} monitors:")
+        for m in monitors:
+            status = status_name(m['status'])
+            out(f"  - {m['friendly_name']}: {status}")
+        out()
+        flush()
+
+        # Test 3: Get status by name (served from the snapshot fetched in test 2)
+        if monitors:
+            out("TEST 3: Get Status by Name")
+            out("-" * 70)
+            # The public lookup used by the monitoring engine, for the first monitor
+            test_monitor = monitors[0]['friendly_name']
+            status = await client.get_monitor_status_by_name(test_monitor)
+            out(f"Monitor '{test_monitor}' (get_monitor_status_by_name): {status_name(status)}")
+
+            # Everything else straight from the cached by-name map
+            statuses = client.monitor_statuses
+            for m in monitors[1:]:
+                name = m['friendly_name']
+                status_text = status_name(statuses.get(name))
+                out(f"Monitor '{name}': {status_text}")
+            out()
+            flush()
+
+    out("=" * 70)
+    out("✅ All tests passed!")
+    out("=" * 70)
+    flush()
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
 